@@ -0,0 +1,82 @@
+import os
+from sqlalchemy import func, literal_column, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression
+from backend.app.db.session import engine
+
+# Substring search over jd_title/resume_filename via an SQLite FTS5 trigram index kept in
+# sync by triggers. LIKE '%...%' can't use a B-tree index and scans every row; a trigram
+# MATCH can. Queries shorter than a trigram, and non-SQLite databases, fall back to ILIKE.
+FTS_TABLE = "evaluations_fts"
+FTS_COLUMNS = ("jd_title", "resume_filename")
+MIN_QUERY_LENGTH = 3
+FTS_MAX_IDS = int(os.getenv("FTS_MAX_IDS", "2000"))
+
+_state = {"enabled": False}
+
+def create_fulltext_index():
+    if engine.dialect.name != "sqlite":
+        return
+    cols = ", ".join(FTS_COLUMNS)
+    new_cols = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_cols = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+            ).first()
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"{cols}, content='evaluations', content_rowid='id', tokenize='trigram')"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON evaluations BEGIN "
+                f"INSERT INTO {FTS_TABLE} (rowid, {cols}) VALUES (new.id, {new_cols}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON evaluations BEGIN "
+                f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {cols} ON evaluations BEGIN "
+                f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+                f"INSERT INTO {FTS_TABLE} (rowid, {cols}) VALUES (new.id, {new_cols}); END"
+            ))
+            if not exists:
+                # Index the rows written before the table existed
+                conn.execute(text(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')"))
+    except OperationalError:
+        # SQLite builds without FTS5 or the trigram tokenizer (< 3.34) keep using ILIKE
+        return
+    _state["enabled"] = True
+
+def substring_filter(db: Session, model_column, value: str):
+    if _state["enabled"] and model_column.key in FTS_COLUMNS and len(value) >= MIN_QUERY_LENGTH:
+        # A quoted phrase of trigrams matches the value anywhere in the column, case-insensitively
+        phrase = '"' + value.replace('"', '""') + '"'
+        ids = db.execute(
+            text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :query LIMIT :limit"),
+            {"query": f"{model_column.key} : {phrase}", "limit": FTS_MAX_IDS + 1}
+        ).scalars().all()
+        # Selective terms become primary-key lookups. Common ones match so many rows that scanning
+        # the timestamp index with ILIKE reaches a page's worth of matches sooner
+        if len(ids) <= FTS_MAX_IDS:
+            return model_column.class_.id.in_(ids)
+    return model_column.ilike(f"%{value}%")
+
+def _is_id_lookup(clause) -> bool:
+    return (
+        isinstance(clause, BinaryExpression)
+        and clause.operator is operators.in_op
+        and getattr(clause.left, "key", None) == "id"
+    )
+
+def prefer_id_lookup(filters: list) -> list:
+    # With an id list in play SQLite may still walk the (verdict, timestamp) index to skip the
+    # sort and probe far more rows. Marking the other predicates as likely true steers it to
+    # primary-key lookups on the ids and a sort of the few matching rows
+    if engine.dialect.name != "sqlite" or not any(_is_id_lookup(f) for f in filters):
+        return filters
+    return [f if _is_id_lookup(f) else func.likelihood(f, literal_column("0.9")) for f in filters]
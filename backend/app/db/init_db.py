@@ -1,8 +1,34 @@
+from sqlalchemy import inspect, text
 from backend.app.db.session import engine
+from backend.app.db.fulltext import create_fulltext_index
 from backend.app.models.evaluation import Base
+from backend.app.models import resume_document  # noqa: F401  registers the table on Base
+from backend.app.models import job_description  # noqa: F401
+
+def add_missing_columns():
+    # create_all never alters existing tables, so add columns introduced since
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {col["name"] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                col_type = column.type.compile(dialect=engine.dialect)
+                with engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+
+def create_missing_indexes():
+    # Likewise, indexes added to __table_args__ later are not created on existing tables
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+    create_missing_indexes()
+    create_fulltext_index()
 
 if __name__ == "__main__":
     init_db()
\ No newline at end of file
@@ -1,73 +1,133 @@
-import os
-from langgraph.graph import StateGraph, END
-from typing import TypedDict
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from backend.app.services.parsing import extract_text
-from backend.app.services.jd_structuring import jd_structuring
+import time
+import inspect
+from collections import defaultdict, deque
+from langgraph.graph import StateGraph, START, END
+from typing import Annotated, Dict, Optional, TypedDict
+import numpy as np
+from backend.app.services.executor import run_cpu
+from backend.app.services.jd_registry import resolve_jd
+from backend.app.services.parsing import aextract_text
 from backend.app.services.resume_matching import compute_hard_match
-from backend.app.services.scoring import compute_semantic_similarity, compute_score
-from backend.app.services.suggestions import generate_suggestions
-# Configure Gemini
-load_dotenv()  # Load variables from your .env file
+from backend.app.services.scoring import acompute_semantic_similarity, compute_score
+from backend.app.services.suggestions import agenerate_suggestions
 
-api_key = os.getenv("GEMINI_API_KEY")  # Safely access your key
+# START ─┬─ parse_jd ─────┬─┬─ hard_match ─────┬─ match_and_score ── suggest ── END
+#        └─ parse_resume ─┘ └─ semantic_match ─┘
+# Nodes are async and return only the keys they set; CPU work goes through the shared pool, and
+# parse_jd goes through the JD registry, so a known JD (by jd_id or content) is not parsed again.
+# Every node also reports its wall time under "timings"; recent ones are kept for node_stats().
+LATENCY_SAMPLE_SIZE = 1024
 
-model = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash",  # ✅ Make sure this model is available
-    temperature=0.1,
-    max_output_tokens=1000,
-    google_api_key=api_key     # ✅ This is what tells LangChain to use your key
-)
+_latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=LATENCY_SAMPLE_SIZE))
+
+
+def merge_timings(current: Dict[str, float], update: Dict[str, float]) -> Dict[str, float]:
+    # Parallel branches report in the same step, so their entries are merged rather than replaced
+    return {**(current or {}), **(update or {})}
 
 
 # Define state schema
-class ResumeState(TypedDict):
+class ResumeState(TypedDict, total=False):
+    # Inputs: the JD as jd_id or as an uploaded file, and the resume file
+    jd_id: Optional[int]
+    jd_filename: str
+    jd_content: bytes
+    resume_filename: str
+    resume_content: bytes
+    # Set by the nodes
     jd_text: str
-    resume_text: str
     jd_struct: dict
+    jd_emb: np.ndarray
+    requirement_embs: np.ndarray
     resume_sections: dict
+    hard_features: dict
+    semantic_similarity: float
     features: dict
     score: dict
-    suggestions: str
-
-# Node 1: Parse JD
-def parse_jd(state: ResumeState) -> ResumeState:
-    jd_result = extract_text("jd.docx", state["jd_text"])
-    jd_struct = jd_structuring(jd_result["raw_text"], jd_result["sections"])
-    return {**state, "jd_struct": jd_struct}
-
-# Node 2: Parse Resume
-def parse_resume(state: ResumeState) -> ResumeState:
-    resume_result = extract_text("resume.pdf", state["resume_text"])
-    return {**state, "resume_sections": resume_result["sections"]}
-
-# Node 3: Match & Score
-def match_and_score(state: ResumeState) -> ResumeState:
-    features = compute_hard_match(state["jd_struct"], state["resume_sections"])
-    features["semantic_similarity"] = compute_semantic_similarity(state["jd_text"], state["resume_sections"])
-    score = compute_score(features)
-    return {**state, "features": features, "score": score}
-
-def suggest_improvements(state: ResumeState) -> ResumeState:
-    suggestions = generate_suggestions(
+    suggestions: dict
+    timings: Annotated[Dict[str, float], merge_timings]
+
+def timed(name: str, node):
+    async def run(state: ResumeState) -> dict:
+        start = time.perf_counter()
+        update = node(state)
+        if inspect.isawaitable(update):
+            update = await update
+        ms = round((time.perf_counter() - start) * 1000, 1)
+        _latencies[name].append(ms)
+        return {**update, "timings": {name: ms}}
+    return run
+
+def node_stats() -> Dict[str, Dict]:
+    stats = {}
+    for name, samples in _latencies.items():
+        ms = np.array(samples, dtype=np.float64)
+        stats[name] = {
+            "runs": len(ms),
+            "ms_p50": round(float(np.percentile(ms, 50)), 1),
+            "ms_p95": round(float(np.percentile(ms, 95)), 1),
+            "ms_max": round(float(ms.max()), 1)
+        }
+    return stats
+
+# Node 1a: Parse JD
+async def parse_jd(state: ResumeState) -> dict:
+    jd = await resolve_jd(state.get("jd_id"), state.get("jd_filename"), state.get("jd_content"))
+    return {
+        "jd_id": jd["id"],
+        "jd_text": jd["raw_text"],
+        "jd_struct": jd["struct"],
+        "jd_emb": jd["embedding"],
+        "requirement_embs": jd["requirement_embeddings"]
+    }
+
+# Node 1b: Parse Resume
+async def parse_resume(state: ResumeState) -> dict:
+    resume_result = await aextract_text(state["resume_filename"], state["resume_content"])
+    if not resume_result.get("raw_text"):
+        raise ValueError("Failed to extract text from resume file.")
+    return {"resume_sections": resume_result["sections"]}
+
+# Node 2a: Hard match
+async def hard_match(state: ResumeState) -> dict:
+    return {"hard_features": await run_cpu(compute_hard_match, state["jd_struct"], state["resume_sections"])}
+
+# Node 2b: Semantic match
+async def semantic_match(state: ResumeState) -> dict:
+    semantic_score = await acompute_semantic_similarity(
+        state["jd_text"], state["resume_sections"], jd_requirements=state["jd_struct"]["must_have"],
+        jd_emb=state.get("jd_emb"), requirement_embs=state.get("requirement_embs")
+    )
+    return {"semantic_similarity": semantic_score}
+
+# Node 3: Combine & Score
+def match_and_score(state: ResumeState) -> dict:
+    features = {**state["hard_features"], "semantic_similarity": state["semantic_similarity"]}
+    return {"features": features, "score": compute_score(features)}
+
+async def suggest_improvements(state: ResumeState) -> dict:
+    suggestions = await agenerate_suggestions(
         missing_skills=state["features"]["missing_must_have"],
         role=state["jd_struct"]["title"],
-        score=state["score"]["final_score"]  # ✅ Pass the score here
+        score=state["score"]["final_score"]
     )
-    return {**state, "suggestions": suggestions}
+    return {"suggestions": suggestions}
 
 # Build LangGraph
 graph = StateGraph(ResumeState)
-graph.add_node("parse_jd", parse_jd)
-graph.add_node("parse_resume", parse_resume)
-graph.add_node("match_and_score", match_and_score)
-graph.add_node("suggest", suggest_improvements)
-
-graph.set_entry_point("parse_jd")
-graph.add_edge("parse_jd", "parse_resume")
-graph.add_edge("parse_resume", "match_and_score")
+graph.add_node("parse_jd", timed("parse_jd", parse_jd))
+graph.add_node("parse_resume", timed("parse_resume", parse_resume))
+graph.add_node("hard_match", timed("hard_match", hard_match))
+graph.add_node("semantic_match", timed("semantic_match", semantic_match))
+graph.add_node("match_and_score", timed("match_and_score", match_and_score))
+graph.add_node("suggest", timed("suggest", suggest_improvements))
+
+graph.add_edge(START, "parse_jd")
+graph.add_edge(START, "parse_resume")
+graph.add_edge(["parse_jd", "parse_resume"], "hard_match")
+graph.add_edge(["parse_jd", "parse_resume"], "semantic_match")
+graph.add_edge(["hard_match", "semantic_match"], "match_and_score")
 graph.add_edge("match_and_score", "suggest")
 graph.add_edge("suggest", END)
 
-resume_graph = graph.compile()
\ No newline at end of file
+resume_graph = graph.compile()
@@ -15,7 +15,9 @@ def evaluate_resume(jd_text: str, resume_text: str) -> dict:
 
     jd_struct = jd_structuring(jd_result["raw_text"], jd_result["sections"])
     hard_features = compute_hard_match(jd_struct, resume_result["sections"])
-    hard_features["semantic_similarity"] = compute_semantic_similarity(jd_result["raw_text"], resume_result["sections"])
+    hard_features["semantic_similarity"] = compute_semantic_similarity(
+        jd_result["raw_text"], resume_result["sections"], jd_requirements=jd_struct["must_have"]
+    )
     score_result = compute_score(hard_features)
     suggestions = generate_suggestions(hard_features["missing_must_have"], jd_struct["title"])
 
@@ -1,9 +1,47 @@
-from fastapi import FastAPI
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from .routers import upload
 from .routers import evaluation
+from .routers import search
+from .routers import routes
+from .db.init_db import init_db
+from .db.session import async_engine
+from .services import executor, jobs, model_registry
+from .services.batching import batcher_stats
+from .services.cache import cache_stats
+from .services.jd_registry import JobDescriptionError
 
-app = FastAPI(title="Resume Relevance MVP", version="0.1.0")
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
+async def warm_up_models():
+    # Runs in the background so the app serves /health while the models load
+    model_registry.set_status("warming")
+    try:
+        # The encoder and the LLM client both live in this process; CPU pool workers only parse
+        # and match, and import that code in their initializer
+        await executor.run_encode(model_registry.warm_up)
+        model_registry.set_status("ready")
+    except Exception as e:
+        model_registry.set_status("failed", str(e))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    await jobs.resume_pending()
+    warm_up_task = asyncio.create_task(warm_up_models()) if WARMUP_ON_STARTUP else None
+    yield
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+    await jobs.drain()
+    executor.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+app = FastAPI(title="Resume Relevance MVP", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,11 +49,42 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(upload.router)
 app.include_router(evaluation.router)
+app.include_router(search.router)
+app.include_router(routes.router)
+
+@app.exception_handler(executor.ExecutorSaturated)
+async def executor_saturated_handler(request: Request, exc: executor.ExecutorSaturated):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly."},
+        headers={"Retry-After": "1"}
+    )
+
+@app.exception_handler(JobDescriptionError)
+async def job_description_error_handler(request: Request, exc: JobDescriptionError):
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    # Liveness: the process is up and serving
+    return {"status": "ok"}
+
+@app.get("/health/ready")
+def ready():
+    # Readiness: models are loaded (or load lazily when warm-up is disabled)
+    state = model_registry.readiness()
+    return JSONResponse(status_code=200 if state["status"] == "ready" else 503, content=state)
+
+@app.get("/cache/stats")
+def get_cache_stats():
+    return cache_stats()
+
+@app.get("/batching/stats")
+def get_batching_stats():
+    # Achieved batch sizes and queueing delay of the encode coalescer
+    return batcher_stats()
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON
+from sqlalchemy import Column, Index, Integer, String, Float, DateTime, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -6,6 +6,13 @@ Base = declarative_base()
 
 class ResumeEvaluation(Base):
     __tablename__ = "evaluations"
+    # History pages are ordered newest first by (timestamp, id), optionally filtered by verdict or title
+    __table_args__ = (
+        Index("ix_evaluations_timestamp_id", "timestamp", "id"),
+        Index("ix_evaluations_verdict_timestamp_id", "verdict", "timestamp", "id"),
+        Index("ix_evaluations_jd_title_timestamp_id", "jd_title", "timestamp", "id"),
+        Index("ix_evaluations_score", "score"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     jd_title = Column(String)
@@ -20,4 +27,5 @@ class ResumeEvaluation(Base):
     missing_must_have = Column(JSON)
     missing_nice_to_have = Column(JSON)
     suggestions = Column(JSON)
+    suggestions_status = Column(String, default="ready")
     timestamp = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, LargeBinary, Text
+from datetime import datetime
+from backend.app.models.evaluation import Base
+
+class JobDescription(Base):
+    __tablename__ = "job_descriptions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String, unique=True, index=True)
+    filename = Column(String)
+    raw_text = Column(Text)
+    title = Column(String)
+    # Output of jd_structuring: must_have, nice_to_have, skills, degrees, years_required
+    structured = Column(JSON)
+    structuring_version = Column(String)
+    embedding_model = Column(String)
+    embedding = Column(LargeBinary)
+    # float32 (n, dim) matrix of the chunked-mode requirement queries
+    requirement_embeddings = Column(LargeBinary)
+    timestamp = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, LargeBinary
+from datetime import datetime
+from backend.app.models.evaluation import Base
+
+class ResumeDocument(Base):
+    __tablename__ = "resume_documents"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String, unique=True, index=True)
+    resume_filename = Column(String)
+    sections = Column(JSON)
+    skills = Column(JSON)
+    # TAXONOMY_FINGERPRINT the skills were extracted with
+    skills_version = Column(String)
+    embedding_model = Column(String)
+    embedding = Column(LargeBinary)
+    evaluation_id = Column(Integer)
+    timestamp = Column(DateTime, default=datetime.utcnow)
@@ -1,54 +1,118 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from ..services.parsing import extract_text
-from ..services.jd_structuring import jd_structuring
-from ..services.resume_matching import compute_hard_match
-from ..services.scoring import compute_semantic_similarity, compute_score
-from ..services.suggestions import generate_suggestions
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from typing import Dict, List, Optional, Tuple
+from ..services.parsing import aextract_many, aextract_text
+from ..services.jd_registry import resolve_jd
+from ..services.resume_matching import compute_hard_match, compute_hard_match_many
+from ..services.scoring import acompute_semantic_similarity, acompute_semantic_similarity_many, compute_score
+from ..services.suggestions import agenerate_suggestions
+from ..services.executor import run_cpu, run_io
+from ..services.jobs import run_in_background, schedule_suggestions, wait_for_suggestions
+from ..services.sse import format_sse
+from ..services.vector_index import index_resumes
+from ..services.analytics import evaluation_stats, jd_titles
+import asyncio
+import base64
+import hashlib
+import time
 from fastapi import Depends
+from sqlalchemy import insert, select, tuple_
 from sqlalchemy.orm import Session
-from backend.app.db.session import SessionLocal
+from backend.app.db.session import AsyncSessionLocal, SessionLocal, get_db
+from backend.app.db.fulltext import prefer_id_lookup, substring_filter
 from backend.app.models.evaluation import ResumeEvaluation
-from fastapi import Query
+from fastapi import Query, Response
 from datetime import datetime
 import csv
+import io
+import os
+import json
+import zlib
+import zipfile
 from fastapi.responses import JSONResponse, StreamingResponse
 from io import StringIO
 
 
 router = APIRouter(prefix="/evaluate", tags=["evaluation"])
 
+EMPTY_SUGGESTIONS = {"resume_fixes": [], "skills_to_add": [], "experience_suggestions": []}
+EVENTS_TIMEOUT = 120
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "100"))
+HISTORY_MAX_PAGE_SIZE = int(os.getenv("HISTORY_MAX_PAGE_SIZE", "1000"))
+HISTORY_COLUMNS = ["id", "jd_title", "resume_filename", "score", "verdict", "timestamp"]
+# Upload limits for /batch, checked against the zip directory before anything is decompressed
+BATCH_MAX_RESUMES = int(os.getenv("BATCH_MAX_RESUMES", "200"))
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+ZIP_MAX_ENTRIES = int(os.getenv("ZIP_MAX_ENTRIES", "500"))
+ZIP_MAX_UNCOMPRESSED_BYTES = int(os.getenv("ZIP_MAX_UNCOMPRESSED_BYTES", str(200 * 1024 * 1024)))
+
+def insert_statement():
+    # ORM bulk INSERT: one executemany (or multi-row VALUES) for the whole list, ids returned in order
+    return insert(ResumeEvaluation).returning(ResumeEvaluation.id, sort_by_parameter_order=True)
+
+def save_records(rows: List[Dict]) -> List[int]:
+    db = SessionLocal()
+    try:
+        ids = db.execute(insert_statement(), rows).scalars().all()
+        db.commit()
+        return list(ids)
+    finally:
+        db.close()
+
+async def asave_records(rows: List[Dict]) -> List[int]:
+    if AsyncSessionLocal is None:
+        return await run_io(save_records, rows)
+    async with AsyncSessionLocal() as db:
+        ids = (await db.execute(insert_statement(), rows)).scalars().all()
+        await db.commit()
+        return list(ids)
+
 @router.post("/")
-async def evaluate(jd_file: UploadFile = File(...), resume_file: UploadFile = File(...)):
+async def evaluate(
+    resume_file: UploadFile = File(...),
+    jd_file: Optional[UploadFile] = File(None),
+    jd_id: Optional[int] = Form(None),
+    mode: str = Query("sync", pattern="^(sync|async)$")
+):
     # Step 1: Read files
-    jd_bytes = await jd_file.read()
+    jd_bytes = await jd_file.read() if jd_file else None
     resume_bytes = await resume_file.read()
 
-    # Step 2: Extract text
-    jd_result = extract_text(jd_file.filename, jd_bytes)
-    resume_result = extract_text(resume_file.filename, resume_bytes)
+    # Step 2: Resolve the JD (stored ones skip parsing, structuring and encoding) and extract the resume
+    jd, resume_result = await asyncio.gather(
+        resolve_jd(jd_id, jd_file.filename if jd_file else None, jd_bytes),
+        aextract_text(resume_file.filename, resume_bytes)
+    )
 
     # Step 3: Validate
-    if not jd_result.get("raw_text") or not resume_result.get("raw_text"):
-        raise HTTPException(status_code=400, detail="Failed to extract text from one or both files.")
+    if not resume_result.get("raw_text"):
+        raise HTTPException(status_code=400, detail="Failed to extract text from resume file.")
 
-    # Step 4: Structure and score
-    jd_struct = jd_structuring(jd_result["raw_text"], jd_result["sections"])
-    hard_features = compute_hard_match(jd_struct, resume_result["sections"])
-    semantic_score = compute_semantic_similarity(jd_result["raw_text"], resume_result["sections"])
+    # Step 4: Score
+    jd_struct = jd["struct"]
+    hard_features, semantic_score = await asyncio.gather(
+        run_cpu(compute_hard_match, jd_struct, resume_result["sections"]),
+        acompute_semantic_similarity(
+            jd["raw_text"], resume_result["sections"], jd_requirements=jd_struct["must_have"],
+            jd_emb=jd["embedding"], requirement_embs=jd["requirement_embeddings"]
+        )
+    )
     hard_features["semantic_similarity"] = semantic_score
     score_result = compute_score(hard_features)
-    suggestions = generate_suggestions(
-        missing_skills=hard_features["missing_must_have"],
-        role=jd_struct["title"],
-        score=score_result["final_score"]
-    )
 
-    # ✅ Step 5: Save to DB — place this here
-    from backend.app.db.session import SessionLocal
-    from backend.app.models.evaluation import ResumeEvaluation
+    # In async mode the score is returned now and suggestions are filled in by a background job
+    if mode == "async":
+        suggestions, status = None, "pending"
+    else:
+        suggestions = await agenerate_suggestions(
+            missing_skills=hard_features["missing_must_have"],
+            role=jd_struct["title"],
+            score=score_result["final_score"]
+        )
+        status = "failed" if suggestions.get("error") else "ready"
 
-    db = SessionLocal()
-    record = ResumeEvaluation(
+    # Step 5: Save to DB
+    record = dict(
         jd_title=jd_struct["title"],
         resume_filename=resume_file.filename,
         score=score_result["final_score"],
@@ -60,14 +124,20 @@ async def evaluate(jd_file: UploadFile = File(...), resume_file: UploadFile = Fi
         experience_match=hard_features["experience_match"],
         missing_must_have=hard_features["missing_must_have"],
         missing_nice_to_have=hard_features["missing_nice_to_have"],
-        suggestions=suggestions
+        suggestions=suggestions,
+        suggestions_status=status
     )
-    db.add(record)
-    db.commit()
-    db.refresh(record)
+    [record_id] = await asave_records([record])
+    if mode == "async":
+        schedule_suggestions(record_id, hard_features["missing_must_have"], jd_struct["title"], score_result["final_score"])
+    run_in_background(index_resumes, [
+        (resume_file.filename, hashlib.sha256(resume_bytes).hexdigest(), resume_result["sections"], record_id)
+    ])
 
     # Step 6: Return response
-    return {
+    response = {
+        "id": record_id,
+        "jd_id": jd["id"],
         "jd_title": jd_struct["title"],
         "resume_filename": resume_file.filename,
         "score": score_result["final_score"],
@@ -79,45 +149,224 @@ async def evaluate(jd_file: UploadFile = File(...), resume_file: UploadFile = Fi
         "experience_match": hard_features["experience_match"],
         "missing_must_have": hard_features["missing_must_have"],
         "missing_nice_to_have": hard_features["missing_nice_to_have"],
-        "suggestions": suggestions
+        "suggestions": suggestions,
+        "suggestions_status": status
     }
+    if mode == "async":
+        response["status_url"] = f"{router.prefix}/{record_id}"
+        response["events_url"] = f"{router.prefix}/{record_id}/events"
+        return JSONResponse(status_code=202, content=response)
+    return response
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async def expand_resume_uploads(files: List[UploadFile]) -> List[Tuple[str, bytes]]:
+    # Zip archives are unpacked so a whole folder of resumes can be sent as one part
+    resumes = []
+    for upload in files:
+        content = await upload.read()
+        if upload.filename and upload.filename.lower().endswith(".zip"):
+            try:
+                with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                    infos = archive.infolist()
+                    if len(infos) > ZIP_MAX_ENTRIES:
+                        raise HTTPException(status_code=413, detail=f"Too many entries in {upload.filename}.")
+                    if sum(info.file_size for info in infos) > ZIP_MAX_UNCOMPRESSED_BYTES:
+                        raise HTTPException(status_code=413, detail=f"{upload.filename} is too large uncompressed.")
+                    for info in infos:
+                        name = os.path.basename(info.filename)
+                        if info.is_dir() or not name or name.startswith(".") or "__MACOSX" in info.filename:
+                            continue
+                        if info.file_size > RESUME_MAX_BYTES:
+                            raise HTTPException(status_code=413, detail=f"{info.filename} exceeds the resume size limit.")
+                        check_resume_count(len(resumes) + 1)
+                        # The declared size bounds what ZipExtFile will decompress
+                        with archive.open(info) as entry:
+                            resumes.append((name, entry.read(RESUME_MAX_BYTES + 1)))
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"Invalid zip archive: {upload.filename}")
+        else:
+            if len(content) > RESUME_MAX_BYTES:
+                raise HTTPException(status_code=413, detail=f"{upload.filename} exceeds the resume size limit.")
+            check_resume_count(len(resumes) + 1)
+            resumes.append((upload.filename, content))
+    return resumes
 
-@router.get("/history")
-def get_history(
+def check_resume_count(count: int):
+    if count > BATCH_MAX_RESUMES:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_RESUMES} resumes per batch.")
+
+@router.post("/batch")
+async def evaluate_batch(
+    resume_files: List[UploadFile] = File(...),
+    jd_file: Optional[UploadFile] = File(None),
+    jd_id: Optional[int] = Form(None),
+    include_suggestions: bool = Form(False)
+):
+    # Step 1: Parse, structure and embed the JD once for the whole batch, or load it by jd_id
+    jd_bytes = await jd_file.read() if jd_file else None
+    jd = await resolve_jd(jd_id, jd_file.filename if jd_file else None, jd_bytes)
+    jd_struct = jd["struct"]
+
+    resumes = await expand_resume_uploads(resume_files)
+    if not resumes:
+        raise HTTPException(status_code=400, detail="No resumes provided.")
+
+    # Step 2: Extract text from every resume, spread across the worker pool
+    extracted = await aextract_many(resumes)
+    parsed, failed = [], []
+    for (filename, content), resume_result in zip(resumes, extracted):
+        if not resume_result.get("raw_text"):
+            failed.append({"resume_filename": filename, "error": "Failed to extract text."})
+            continue
+        parsed.append((filename, hashlib.sha256(content).hexdigest(), resume_result["sections"]))
+
+    # Step 3: Semantic similarity in one encoder pass, hard matching in one cdist call
+    semantic_scores, hard_features_list = await asyncio.gather(
+        acompute_semantic_similarity_many(
+            jd["raw_text"], [sections for _, _, sections in parsed],
+            jd_emb=jd["embedding"], jd_requirements=jd_struct["must_have"],
+            requirement_embs=jd["requirement_embeddings"]
+        ),
+        run_cpu(compute_hard_match_many, jd_struct, [sections for _, _, sections in parsed])
+    )
+
+    # Step 4: Final score and optional suggestions per resume
+    for hard_features, semantic_score in zip(hard_features_list, semantic_scores):
+        hard_features["semantic_similarity"] = semantic_score
+    score_results = [compute_score(hard_features) for hard_features in hard_features_list]
+    if include_suggestions:
+        suggestions_list = await asyncio.gather(*(
+            agenerate_suggestions(
+                missing_skills=hard_features["missing_must_have"],
+                role=jd_struct["title"],
+                score=score_result["final_score"]
+            )
+            for hard_features, score_result in zip(hard_features_list, score_results)
+        ))
+    else:
+        suggestions_list = [dict(EMPTY_SUGGESTIONS) for _ in parsed]
+
+    results, records = [], []
+    for (filename, _, _), semantic_score, hard_features, score_result, suggestions in zip(
+        parsed, semantic_scores, hard_features_list, score_results, suggestions_list
+    ):
+        record = dict(
+            jd_title=jd_struct["title"],
+            resume_filename=filename,
+            score=score_result["final_score"],
+            verdict=score_result["verdict"],
+            semantic_similarity=semantic_score,
+            must_have_score=hard_features["must_have_score"],
+            nice_to_have_score=hard_features["nice_to_have_score"],
+            degree_match=str(hard_features["degree_match"]),
+            experience_match=hard_features["experience_match"],
+            missing_must_have=hard_features["missing_must_have"],
+            missing_nice_to_have=hard_features["missing_nice_to_have"],
+            suggestions=suggestions,
+            suggestions_status=("failed" if suggestions.get("error") else "ready") if include_suggestions else "skipped"
+        )
+        records.append(record)
+        results.append({
+            "resume_filename": filename,
+            "score": score_result["final_score"],
+            "verdict": score_result["verdict"],
+            "semantic_similarity": semantic_score,
+            "must_have_score": hard_features["must_have_score"],
+            "nice_to_have_score": hard_features["nice_to_have_score"],
+            "degree_match": hard_features["degree_match"],
+            "experience_match": hard_features["experience_match"],
+            "missing_must_have": hard_features["missing_must_have"],
+            "missing_nice_to_have": hard_features["missing_nice_to_have"],
+            "suggestions": suggestions
+        })
+
+    # Step 5: Save the whole batch in one transaction
+    ids = await asave_records(records)
+    for result, record_id in zip(results, ids):
+        result["id"] = record_id
+
+    # Keep the resumes searchable for future JDs without re-parsing
+    run_in_background(index_resumes, [
+        (filename, content_hash, sections, record_id)
+        for (filename, content_hash, sections), record_id in zip(parsed, ids)
+    ])
+
+    # Step 6: Rank
+    results.sort(key=lambda r: r["score"], reverse=True)
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+
+    return {
+        "jd_id": jd["id"],
+        "jd_title": jd_struct["title"],
+        "total": len(resumes),
+        "evaluated": len(results),
+        "results": results,
+        "failed": failed
+    }
+
+def history_filters(
     verdict: str = Query(None),
     min_score: float = Query(None),
     max_score: float = Query(None),
     jd_title: str = Query(None),
+    jd_title_exact: bool = Query(False),
     resume_filename: str = Query(None),
     start_date: datetime = Query(None),
     end_date: datetime = Query(None),
     db: Session = Depends(get_db)
-):
-    query = db.query(ResumeEvaluation)
-
+) -> list:
+    # Shared by /history and the exports so both accept the same query parameters
+    filters = []
     if verdict:
-        query = query.filter(ResumeEvaluation.verdict == verdict)
+        filters.append(ResumeEvaluation.verdict == verdict)
     if min_score is not None:
-        query = query.filter(ResumeEvaluation.score >= min_score)
+        filters.append(ResumeEvaluation.score >= min_score)
     if max_score is not None:
-        query = query.filter(ResumeEvaluation.score <= max_score)
-    if jd_title:
-        query = query.filter(ResumeEvaluation.jd_title.ilike(f"%{jd_title}%"))
+        filters.append(ResumeEvaluation.score <= max_score)
+    if jd_title and jd_title_exact:
+        filters.append(ResumeEvaluation.jd_title == jd_title)
+    elif jd_title:
+        filters.append(substring_filter(db, ResumeEvaluation.jd_title, jd_title))
     if resume_filename:
-        query = query.filter(ResumeEvaluation.resume_filename.ilike(f"%{resume_filename}%"))
+        filters.append(substring_filter(db, ResumeEvaluation.resume_filename, resume_filename))
     if start_date:
-        query = query.filter(ResumeEvaluation.timestamp >= start_date)
+        filters.append(ResumeEvaluation.timestamp >= start_date)
     if end_date:
-        query = query.filter(ResumeEvaluation.timestamp <= end_date)
+        filters.append(ResumeEvaluation.timestamp <= end_date)
+    return filters
 
-    records = query.order_by(ResumeEvaluation.timestamp.desc()).all()
+def encode_cursor(timestamp: datetime, id: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{id}".encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        timestamp, id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(timestamp), int(id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+@router.get("/history")
+def get_history(
+    response: Response,
+    filters: list = Depends(history_filters),
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=HISTORY_MAX_PAGE_SIZE),
+    cursor: str = Query(None),
+    db: Session = Depends(get_db)
+):
+    # Keyset pagination: each page resumes after the (timestamp, id) of the previous page's last
+    # row, walking ix_evaluations_timestamp_id instead of counting past skipped rows with OFFSET
+    if cursor:
+        filters = filters + [tuple_(ResumeEvaluation.timestamp, ResumeEvaluation.id) < decode_cursor(cursor)]
+    rows = db.execute(
+        select(*(getattr(ResumeEvaluation, c) for c in HISTORY_COLUMNS))
+        .where(*prefer_id_lookup(filters))
+        .order_by(ResumeEvaluation.timestamp.desc(), ResumeEvaluation.id.desc())
+        .limit(limit + 1)
+    ).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].timestamp, rows[-1].id)
 
     return [
         {
@@ -128,52 +377,133 @@ def get_history(
             "verdict": r.verdict,
             "timestamp": r.timestamp.isoformat()
         }
-        for r in records
+        for r in rows
     ]
+
+CSV_EXPORT_COLUMNS = [
+    "id", "jd_title", "resume_filename", "score", "verdict", "semantic_similarity",
+    "must_have_score", "nice_to_have_score", "degree_match", "experience_match", "timestamp"
+]
+JSON_EXPORT_COLUMNS = CSV_EXPORT_COLUMNS[:-1] + [
+    "missing_must_have", "missing_nice_to_have", "suggestions", "timestamp"
+]
+
+def iter_export_rows(columns: List[str], filters: list):
+    # Only the exported columns are selected, and rows arrive EXPORT_BATCH_SIZE at a time from
+    # a streaming cursor. The generator owns its session: it outlives the request's dependencies
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            select(*(getattr(ResumeEvaluation, c) for c in columns))
+            .where(*prefer_id_lookup(filters))
+            .order_by(ResumeEvaluation.timestamp.desc(), ResumeEvaluation.id.desc())
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        for rows in result.partitions():
+            yield rows
+    finally:
+        db.close()
+
+def csv_chunks(filters: list):
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_EXPORT_COLUMNS)
+    for rows in iter_export_rows(CSV_EXPORT_COLUMNS, filters):
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+def export_record(row) -> dict:
+    record = dict(zip(JSON_EXPORT_COLUMNS, row))
+    record["timestamp"] = record["timestamp"].isoformat() if record["timestamp"] else None
+    return record
+
+def ndjson_chunks(filters: list):
+    for rows in iter_export_rows(JSON_EXPORT_COLUMNS, filters):
+        yield "".join(json.dumps(export_record(row)) + "\n" for row in rows)
+
+def json_array_chunks(filters: list):
+    yield "["
+    first = True
+    for rows in iter_export_rows(JSON_EXPORT_COLUMNS, filters):
+        chunk = ",".join(json.dumps(export_record(row)) for row in rows)
+        yield chunk if first else "," + chunk
+        first = False
+    yield "]"
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+def export_response(chunks, filename: str, media_type: str, compress: bool) -> StreamingResponse:
+    if compress:
+        chunks, filename, media_type = gzip_chunks(chunks), filename + ".gz", "application/gzip"
+    return StreamingResponse(
+        chunks, media_type=media_type, headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
 @router.get("/export/json")
-def export_json(db: Session = Depends(get_db)):
-    records = db.query(ResumeEvaluation).order_by(ResumeEvaluation.timestamp.desc()).all()
-    return [
-        {
-            "id": r.id,
-            "jd_title": r.jd_title,
-            "resume_filename": r.resume_filename,
-            "score": r.score,
-            "verdict": r.verdict,
-            "semantic_similarity": r.semantic_similarity,
-            "must_have_score": r.must_have_score,
-            "nice_to_have_score": r.nice_to_have_score,
-            "degree_match": r.degree_match,
-            "experience_match": r.experience_match,
-            "missing_must_have": r.missing_must_have,
-            "missing_nice_to_have": r.missing_nice_to_have,
-            "suggestions": r.suggestions,
-            "timestamp": r.timestamp.isoformat()
-        }
-        for r in records
-    ]
+def export_json(filters: list = Depends(history_filters), compress: bool = Query(False, alias="gzip")):
+    return export_response(json_array_chunks(filters), "evaluations.json", "application/json", compress)
 
+@router.get("/export/ndjson")
+def export_ndjson(filters: list = Depends(history_filters), compress: bool = Query(False, alias="gzip")):
+    return export_response(ndjson_chunks(filters), "evaluations.ndjson", "application/x-ndjson", compress)
 
 @router.get("/export/csv")
-def export_csv(db: Session = Depends(get_db)):
-    records = db.query(ResumeEvaluation).order_by(ResumeEvaluation.timestamp.desc()).all()
-
-    output = StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
-        "id", "jd_title", "resume_filename", "score", "verdict", "semantic_similarity",
-        "must_have_score", "nice_to_have_score", "degree_match", "experience_match", "timestamp"
-    ])
+def export_csv(filters: list = Depends(history_filters), compress: bool = Query(False, alias="gzip")):
+    return export_response(csv_chunks(filters), "evaluations.csv", "text/csv", compress)
+
+
+@router.get("/stats")
+def get_stats(
+    filters: list = Depends(history_filters),
+    days: int = Query(None, ge=1),
+    bins: int = Query(10, ge=1, le=100),
+    top_n: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    # Aggregates for the recruiter dashboard; accepts the same filters as /history
+    return evaluation_stats(db, filters, bins=bins, top_n=top_n, days=days)
+
+@router.get("/titles")
+def get_titles(days: int = Query(None, ge=1), db: Session = Depends(get_db)):
+    # Distinct JD titles for filter dropdowns
+    return jd_titles(db, days=days)
 
-    for r in records:
-        writer.writerow([
-            r.id, r.jd_title, r.resume_filename, r.score, r.verdict, r.semantic_similarity,
-            r.must_have_score, r.nice_to_have_score, r.degree_match, r.experience_match, r.timestamp
-        ])
 
-    output.seek(0)
-    return StreamingResponse(output, media_type="text/csv", headers={"Content-Disposition": "attachment; filename=evaluations.csv"})
+def serialize_evaluation(record: ResumeEvaluation) -> dict:
+    return {
+        "id": record.id,
+        "jd_title": record.jd_title,
+        "resume_filename": record.resume_filename,
+        "score": record.score,
+        "verdict": record.verdict,
+        "semantic_similarity": record.semantic_similarity,
+        "must_have_score": record.must_have_score,
+        "nice_to_have_score": record.nice_to_have_score,
+        "degree_match": record.degree_match,
+        "experience_match": record.experience_match,
+        "missing_skills": record.missing_must_have,
+        "feedback": "\n".join((record.suggestions or {}).get("resume_fixes", [])),
+        "suggestions": record.suggestions,
+        "suggestions_status": record.suggestions_status or "ready",
+        "timestamp": record.timestamp.isoformat()
+    }
 
+def load_evaluation(id: int):
+    db = SessionLocal()
+    try:
+        record = db.query(ResumeEvaluation).filter(ResumeEvaluation.id == id).first()
+        return serialize_evaluation(record) if record else None
+    finally:
+        db.close()
 
 @router.get("/{id}")
 def get_evaluation_by_id(id: int, db: Session = Depends(get_db)):
@@ -181,18 +511,28 @@ def get_evaluation_by_id(id: int, db: Session = Depends(get_db)):
     if not record:
         raise HTTPException(status_code=404, detail="Evaluation not found")
 
-    return {
-    "id": record.id,
-    "jd_title": record.jd_title,
-    "resume_filename": record.resume_filename,
-    "score": record.score,
-    "verdict": record.verdict,
-    "semantic_similarity": record.semantic_similarity,
-    "must_have_score": record.must_have_score,
-    "nice_to_have_score": record.nice_to_have_score,
-    "degree_match": record.degree_match,
-    "experience_match": record.experience_match,
-    "missing_skills": record.missing_must_have,
-    "feedback": "\n".join(record.suggestions.get("resume_fixes", [])),  # ✅ This line
-    "timestamp": record.timestamp.isoformat()
-}
\ No newline at end of file
+    return serialize_evaluation(record)
+
+@router.get("/{id}/events")
+async def evaluation_events(id: int):
+    evaluation = await run_io(load_evaluation, id)
+    if not evaluation:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+
+    async def stream():
+        current = evaluation
+        yield format_sse("score", current)
+        deadline = time.monotonic() + EVENTS_TIMEOUT
+        while current["suggestions_status"] == "pending":
+            if time.monotonic() > deadline:
+                yield format_sse("timeout", {"id": id})
+                return
+            await wait_for_suggestions(id, timeout=1.0)
+            current = await run_io(load_evaluation, id)
+        yield format_sse("suggestions", {
+            "id": id,
+            "suggestions_status": current["suggestions_status"],
+            "suggestions": current["suggestions"]
+        })
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
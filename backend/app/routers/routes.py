@@ -1,20 +1,138 @@
-from fastapi import APIRouter, UploadFile
-from backend.app.langchain.graph import resume_graph
+import os
+import time
+from typing import Dict, List, Optional
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from backend.app.langchain.graph import node_stats, resume_graph
+from backend.app.services.jd_registry import JobDescriptionError
+from backend.app.services.sse import format_sse
+from .evaluation import expand_resume_uploads
 
 router = APIRouter()
 
+# Resumes evaluated at once by one /evaluate-graph request
+GRAPH_MAX_CONCURRENCY = int(os.getenv("GRAPH_MAX_CONCURRENCY", "4"))
+# SSE event emitted when each node finishes
+NODE_EVENTS = {
+    "parse_jd": "parsed",
+    "parse_resume": "parsed",
+    "hard_match": "matched",
+    "semantic_match": "matched",
+    "match_and_score": "scored",
+    "suggest": "suggestions"
+}
+
+def graph_input(jd_id: Optional[int], jd_filename: Optional[str], jd_bytes: Optional[bytes], filename: str, content: bytes) -> Dict:
+    return {
+        "jd_id": jd_id,
+        "jd_filename": jd_filename,
+        "jd_content": jd_bytes,
+        "resume_filename": filename,
+        "resume_content": content
+    }
+
+def node_result(node: str, update: Dict) -> Dict:
+    # The JSON-safe part of a node's update (no embeddings, file bytes or parsed text)
+    if node == "parse_jd":
+        jd_struct = update["jd_struct"]
+        return {
+            "jd_id": update["jd_id"],
+            "jd_title": jd_struct["title"],
+            "must_have_skills": jd_struct["must_have_skills"],
+            "nice_to_have_skills": jd_struct["nice_to_have_skills"],
+            "years_required": jd_struct["years_required"]
+        }
+    if node == "parse_resume":
+        return {"sections": sorted(update["resume_sections"])}
+    if node == "hard_match":
+        return update["hard_features"]
+    if node == "semantic_match":
+        return {"semantic_similarity": update["semantic_similarity"]}
+    if node == "match_and_score":
+        return {
+            "score": update["score"]["final_score"],
+            "verdict": update["score"]["verdict"],
+            "missing_must_have": update["features"]["missing_must_have"]
+        }
+    return {"suggestions": update["suggestions"]}
+
 @router.post("/evaluate-graph")
-async def evaluate_graph(jd: UploadFile, resume: UploadFile):
-    jd_bytes = await jd.read()
-    resume_bytes = await resume.read()
+async def evaluate_graph(
+    resume: List[UploadFile] = File(...),
+    jd: Optional[UploadFile] = File(None),
+    jd_id: Optional[int] = Form(None)
+):
+    jd_bytes = await jd.read() if jd else None
+    resumes = await expand_resume_uploads(resume)
 
-    result = resume_graph.invoke({
-        "jd_text": jd_bytes,
-        "resume_text": resume_bytes
-    })
+    # Each run's parse_jd branch goes through the JD registry, which parses a new JD once per batch
+    inputs = [
+        graph_input(jd_id, jd.filename if jd else None, jd_bytes, filename, content)
+        for filename, content in resumes
+    ]
+    outputs = await resume_graph.abatch(
+        inputs, config={"max_concurrency": GRAPH_MAX_CONCURRENCY}, return_exceptions=True
+    )
 
-    return {
-        "score": result["score"]["final_score"],
-        "verdict": result["score"]["verdict"],
-        "suggestions": result["suggestions"]
-    }
\ No newline at end of file
+    results, failed = [], []
+    for (filename, _), output in zip(resumes, outputs):
+        if isinstance(output, JobDescriptionError):
+            raise output
+        if isinstance(output, Exception):
+            failed.append({"resume_filename": filename, "error": str(output)})
+            continue
+        results.append({
+            "resume_filename": filename,
+            "jd_id": output["jd_id"],
+            "jd_title": output["jd_struct"]["title"],
+            "score": output["score"]["final_score"],
+            "verdict": output["score"]["verdict"],
+            "semantic_similarity": output["semantic_similarity"],
+            "missing_must_have": output["features"]["missing_must_have"],
+            "suggestions": output["suggestions"],
+            "timings": output["timings"]
+        })
+    results.sort(key=lambda r: r["score"], reverse=True)
+    return {"results": results, "failed": failed}
+
+@router.post("/evaluate-graph/stream")
+async def evaluate_graph_stream(
+    resume: UploadFile = File(...),
+    jd: Optional[UploadFile] = File(None),
+    jd_id: Optional[int] = Form(None)
+):
+    # One event per finished node, so the score is out while the LLM is still writing suggestions
+    if jd is None and jd_id is None:
+        raise HTTPException(status_code=400, detail="Provide either jd or jd_id.")
+    jd_bytes = await jd.read() if jd else None
+    state = graph_input(jd_id, jd.filename if jd else None, jd_bytes, resume.filename, await resume.read())
+
+    async def stream():
+        start = time.perf_counter()
+        timings = {}
+        try:
+            async for chunk in resume_graph.astream(state, stream_mode="updates"):
+                for node, update in chunk.items():
+                    timings.update(update.get("timings", {}))
+                    yield format_sse(NODE_EVENTS.get(node, node), {
+                        "node": node,
+                        "ms": update.get("timings", {}).get(node),
+                        "result": node_result(node, update)
+                    })
+        except JobDescriptionError as e:
+            yield format_sse("error", {"status_code": e.status_code, "detail": e.detail})
+            return
+        except ValueError as e:
+            yield format_sse("error", {"status_code": 400, "detail": str(e)})
+            return
+        except Exception as e:
+            yield format_sse("error", {"status_code": 500, "detail": str(e)})
+            return
+        yield format_sse("done", {"timings": timings, "total_ms": round((time.perf_counter() - start) * 1000, 1)})
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@router.get("/evaluate-graph/stats")
+def get_graph_stats():
+    # Per-node latency over the most recent runs of either endpoint
+    return node_stats()
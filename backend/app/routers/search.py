@@ -0,0 +1,61 @@
+from fastapi import APIRouter, UploadFile, File, Form
+from typing import Optional
+from ..services.jd_registry import resolve_jd
+from ..services.vector_index import resume_index, load_documents
+from ..services.ranking import (
+    rank_candidates, SHORTLIST_SIZE, RESULTS_SIZE, SUGGESTIONS_SIZE, SHORTLIST_MIN_SCORE,
+    MAX_SHORTLIST_SIZE, MAX_RESULTS_SIZE, MAX_SUGGESTIONS_SIZE
+)
+from ..services.executor import run_io
+import time
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+@router.post("/candidates")
+async def search_candidates(
+    jd_file: Optional[UploadFile] = File(None),
+    jd_id: Optional[int] = Form(None),
+    top_k: int = Form(10)
+):
+    # Only the JD is parsed and embedded (or loaded by jd_id); resumes come from the stored index
+    jd_bytes = await jd_file.read() if jd_file else None
+    jd = await resolve_jd(jd_id, jd_file.filename if jd_file else None, jd_bytes)
+    hits = await run_io(resume_index.search, jd["embedding"], top_k)
+    docs = await run_io(load_documents, [doc_id for doc_id, _ in hits])
+
+    return {
+        "jd_id": jd["id"],
+        "jd_title": jd["struct"]["title"],
+        "indexed": len(resume_index),
+        "results": [
+            {**docs[doc_id], "similarity": similarity}
+            for doc_id, similarity in hits
+            if doc_id in docs
+        ]
+    }
+
+@router.post("/rank")
+async def rank(
+    jd_file: Optional[UploadFile] = File(None),
+    jd_id: Optional[int] = Form(None),
+    shortlist_size: int = Form(SHORTLIST_SIZE, ge=0, le=MAX_SHORTLIST_SIZE),
+    results_size: int = Form(RESULTS_SIZE, ge=0, le=MAX_RESULTS_SIZE),
+    # Only results get suggestions, so anything above results_size is capped to it
+    suggestions_size: int = Form(SUGGESTIONS_SIZE, ge=0, le=MAX_SUGGESTIONS_SIZE),
+    min_shortlist_score: float = Form(SHORTLIST_MIN_SCORE)
+):
+    start = time.perf_counter()
+    jd_bytes = await jd_file.read() if jd_file else None
+    jd = await resolve_jd(jd_id, jd_file.filename if jd_file else None, jd_bytes)
+    jd_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    ranking = await rank_candidates(
+        jd["raw_text"], jd["struct"], jd["embedding"],
+        requirement_embs=jd["requirement_embeddings"],
+        shortlist_size=shortlist_size,
+        results_size=results_size,
+        suggestions_size=suggestions_size,
+        min_shortlist_score=min_shortlist_score
+    )
+    ranking["timings"] = {"jd_ms": jd_ms, **ranking["timings"]}
+    return {"jd_id": jd["id"], "jd_title": jd["struct"]["title"], **ranking}
@@ -1,25 +1,26 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from ..services.parsing import extract_text
-from ..services.jd_structuring import jd_structuring
+from ..services.jd_registry import register_jd
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
 @router.post("/jd")
 async def upload_jd(file: UploadFile = File(...)):
     content = await file.read()
-    result = extract_text(file.filename, content)
-    if not result.get("raw_text"):
+    # Stored by content hash; the returned jd_id can be sent to /evaluate instead of the file
+    jd = await register_jd(file.filename, content)
+    if jd is None:
         raise HTTPException(status_code=400, detail="Unable to extract text from file.")
 
-    structured = jd_structuring(result["raw_text"], result["sections"])
+    structured = jd["struct"]
 
     return {
+        "jd_id": jd["id"],
         "filename": file.filename,
         "title": structured["title"],
         "must_have_skills": structured["must_have"],
         "nice_to_have_skills": structured["nice_to_have"],
         "years_required": structured["years_required"],
         "degrees": structured["degrees"],
-        "chars": len(result["raw_text"]),
-        "sample": result["raw_text"][:600]
-    }
\ No newline at end of file
+        "chars": len(jd["raw_text"]),
+        "sample": jd["raw_text"][:600]
+    }
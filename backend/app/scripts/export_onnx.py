@@ -0,0 +1,52 @@
+import os
+import argparse
+import torch
+from sentence_transformers import SentenceTransformer
+
+# Exports the SentenceTransformer's transformer to ONNX for EMBEDDING_BACKEND=onnx / onnx-int8:
+#   python -m backend.app.scripts.export_onnx --model all-MiniLM-L6-v2 --out ./onnx/all-MiniLM-L6-v2
+# Pooling and normalization stay in OnnxEmbeddingModel, so only token embeddings are exported.
+
+
+def export(model_name: str, out_dir: str, opset: int = 17, quantize: bool = True):
+    os.makedirs(out_dir, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+
+    model_path = os.path.join(out_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in input_names),
+            model_path,
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True,
+            dynamo=False
+        )
+    tokenizer.save_pretrained(out_dir)
+    print(f"wrote {model_path}")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        int8_path = os.path.join(out_dir, "model_int8.onnx")
+        quantize_dynamic(model_path, int8_path, weight_type=QuantType.QInt8)
+        print(f"wrote {int8_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX (fp32 and int8)")
+    parser.add_argument("--model", default=os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"))
+    parser.add_argument("--out", default=None, help="defaults to ./onnx/<model>")
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--no-quantize", action="store_true")
+    args = parser.parse_args()
+    export(args.model, args.out or os.path.join("onnx", os.path.basename(args.model)), args.opset, not args.no_quantize)
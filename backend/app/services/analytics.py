@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+from typing import Dict, List
+from sqlalchemy import Integer, cast, func, select, true
+from sqlalchemy.orm import Session
+from backend.app.models.evaluation import ResumeEvaluation
+
+# Dashboard aggregates computed with GROUP BY in the database. Every list is bounded (fixed
+# histogram bins, top-N titles and skills, capped timeline), so the payload stays the same
+# size however large the evaluations table grows.
+TIMELINE_MAX_DAYS = 90
+
+
+def _missing_skills_table(db: Session):
+    # JSON arrays are unnested with json_each on SQLite and json_array_elements_text on PostgreSQL
+    if db.get_bind().dialect.name == "postgresql":
+        return func.json_array_elements_text(ResumeEvaluation.missing_must_have).table_valued("value")
+    return func.json_each(ResumeEvaluation.missing_must_have).table_valued("value")
+
+
+def _score_bucket(db: Session, width: float, bins: int):
+    # Histogram bin of each score, clamped to [0, bins - 1]. PostgreSQL has no scalar min/max
+    # (least/greatest instead) and its integer CAST rounds, so the bin is floored explicitly there
+    score = ResumeEvaluation.score
+    if db.get_bind().dialect.name == "postgresql":
+        return func.least(func.greatest(cast(func.floor(score / width), Integer), 0), bins - 1)
+    return func.min(func.max(cast(score / width, Integer), 0), bins - 1)
+
+
+def evaluation_stats(db: Session, filters: list, bins: int = 10, top_n: int = 10, days: int = None) -> Dict:
+    E = ResumeEvaluation
+    filters = list(filters)
+    if days:
+        filters.append(E.timestamp >= datetime.utcnow() - timedelta(days=days))
+
+    total, avg_score = db.execute(select(func.count(E.id), func.avg(E.score)).where(*filters)).one()
+
+    verdicts = dict(db.execute(select(E.verdict, func.count(E.id)).where(*filters).group_by(E.verdict)).all())
+
+    width = 100 / bins
+    bucket = _score_bucket(db, width, bins)
+    counts = dict(db.execute(
+        select(bucket.label("bucket"), func.count(E.id)).where(*filters, E.score.is_not(None)).group_by("bucket")
+    ).all())
+    histogram = [
+        {"min": round(i * width, 2), "max": round((i + 1) * width, 2), "count": counts.get(i, 0)}
+        for i in range(bins)
+    ]
+
+    titles = db.execute(
+        select(E.jd_title, func.count(E.id).label("n"), func.avg(E.score))
+        .where(*filters)
+        .group_by(E.jd_title)
+        .order_by(func.count(E.id).desc())
+        .limit(top_n)
+    ).all()
+
+    skill = _missing_skills_table(db)
+    skills = db.execute(
+        select(skill.c.value, func.count().label("n"))
+        .select_from(E)
+        .join(skill, true())
+        .where(*filters)
+        .group_by(skill.c.value)
+        .order_by(func.count().desc())
+        .limit(top_n)
+    ).all()
+
+    day = func.date(E.timestamp)
+    timeline = db.execute(
+        select(day.label("day"), func.count(E.id), func.avg(E.score))
+        .where(*filters)
+        .group_by("day")
+        .order_by(day.desc())
+        .limit(min(days or TIMELINE_MAX_DAYS, TIMELINE_MAX_DAYS))
+    ).all()
+
+    return {
+        "total": total,
+        "average_score": round(avg_score, 1) if avg_score is not None else None,
+        "verdict_counts": {verdict: count for verdict, count in verdicts.items() if verdict},
+        "score_histogram": histogram,
+        "jd_titles": [
+            {"jd_title": title, "count": count, "average_score": round(avg, 1) if avg is not None else None}
+            for title, count, avg in titles
+        ],
+        "top_missing_must_have": [{"skill": value, "count": count} for value, count in skills],
+        "timeline": [
+            {"date": str(d), "count": count, "average_score": round(avg, 1) if avg is not None else None}
+            for d, count, avg in reversed(timeline)
+        ]
+    }
+
+
+def jd_titles(db: Session, days: int = None, limit: int = 500) -> List[str]:
+    # Distinct titles for the dashboard's filter dropdown, without computing the full aggregates
+    E = ResumeEvaluation
+    filters = [E.jd_title.is_not(None)]
+    if days:
+        filters.append(E.timestamp >= datetime.utcnow() - timedelta(days=days))
+    return list(db.scalars(select(E.jd_title).where(*filters).distinct().order_by(E.jd_title).limit(limit)))
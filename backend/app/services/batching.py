@@ -0,0 +1,146 @@
+import time
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import numpy as np
+from .executor import CPU_POOL_WORKERS
+
+# Coalesces concurrent encode calls: requests arriving within window_ms of the first one are
+# encoded together (up to max_batch texts) and each caller gets its own slice back. Up to
+# max_in_flight batches are encoded at once; the next batch is collected while they run.
+
+_batchers: List["MicroBatcher"] = []
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        max_batch: int = 64,
+        window_ms: float = 5.0,
+        executor: Optional[Executor] = None,
+        runner: Optional[Callable[..., Awaitable]] = None,
+        name: str = "encode",
+        sample_size: int = 1024,
+        max_in_flight: int = CPU_POOL_WORKERS
+    ):
+        # runner (e.g. executor.run_cpu) takes precedence over a plain executor
+        self.encode = encode
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self.executor = executor
+        self.runner = runner
+        self.name = name
+        self.max_in_flight = max(1, max_in_flight)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self._batch_sizes = deque(maxlen=sample_size)
+        self._delays_ms = deque(maxlen=sample_size)
+        _batchers.append(self)
+
+    async def submit(self, texts: List[str]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        future = loop.create_future()
+        self._queue.put_nowait((texts, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> List[Tuple[List[str], asyncio.Future, float]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        size = len(batch[0][0])
+        deadline = loop.time() + self.window
+        while size < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _record(self, batch: List[Tuple[List[str], asyncio.Future, float]], size: int):
+        now = time.perf_counter()
+        self.batches += 1
+        self.requests += len(batch)
+        self.texts += size
+        self._batch_sizes.append(size)
+        self._delays_ms.extend((now - enqueued) * 1000 for _, _, enqueued in batch)
+
+    async def _dispatch(self, texts: List[str]) -> np.ndarray:
+        if self.runner is not None:
+            return await self.runner(self.encode, texts)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self.encode, texts)
+
+    async def _encode_batch(self, batch: List[Tuple[List[str], asyncio.Future, float]], texts: List[str], slots: asyncio.Semaphore):
+        try:
+            embs = await self._dispatch(texts)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            slots.release()
+        start = 0
+        for item, future, _ in batch:
+            if not future.done():
+                future.set_result(embs[start:start + len(item)])
+            start += len(item)
+
+    async def _run(self):
+        slots = asyncio.Semaphore(self.max_in_flight)
+        while True:
+            # Wait for a free slot first, so requests arriving meanwhile join the next batch
+            await slots.acquire()
+            batch = await self._collect()
+            # Callers that gave up while queued are dropped before the forward pass
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                slots.release()
+                continue
+            texts = [text for item, _, _ in batch for text in item]
+            self._record(batch, len(texts))
+            task = asyncio.get_running_loop().create_task(self._encode_batch(batch, texts, slots))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    def stats(self) -> Dict:
+        sizes = np.array(self._batch_sizes, dtype=np.float64)
+        delays = np.array(self._delays_ms, dtype=np.float64)
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "max_in_flight": self.max_in_flight,
+            "batches": self.batches,
+            "requests": self.requests,
+            "texts": self.texts,
+            "requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            # Over the most recent sample_size batches / requests
+            "batch_size_mean": round(float(sizes.mean()), 2) if len(sizes) else 0.0,
+            "batch_size_max": int(sizes.max()) if len(sizes) else 0,
+            "queue_delay_ms_p50": round(float(np.percentile(delays, 50)), 2) if len(delays) else 0.0,
+            "queue_delay_ms_p95": round(float(np.percentile(delays, 95)), 2) if len(delays) else 0.0,
+            "queue_delay_ms_max": round(float(delays.max()), 2) if len(delays) else 0.0
+        }
+
+    def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        for task in self._running:
+            task.cancel()
+
+
+def batcher_stats() -> Dict[str, Dict]:
+    return {batcher.name: batcher.stats() for batcher in _batchers}
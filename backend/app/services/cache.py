@@ -0,0 +1,222 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+MB = 1024 * 1024
+# Disk-tier access times are written in batches of this many reads, or this often
+TOUCH_FLUSH_ROWS = int(os.getenv("CACHE_TOUCH_FLUSH_ROWS", "256"))
+TOUCH_FLUSH_SECONDS = float(os.getenv("CACHE_TOUCH_FLUSH_SECONDS", "5"))
+
+_caches: List["TieredCache"] = []
+
+
+class LRUCache:
+    """In-process tier, bounded by total payload bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._data[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.size -= len(evicted)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DiskCache:
+    """SQLite BLOB tier, bounded by total payload bytes; least recently read rows are evicted first.
+
+    Several worker processes may share one file, so the byte total lives in a one-row counter
+    table and is only read and changed inside the writer's BEGIN IMMEDIATE transaction.
+    """
+
+    def __init__(self, path: str, table: str, max_bytes: int):
+        self.path = path
+        self.table = table
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+        # Access times of rows read since the last flush; written in one transaction so that
+        # hits do not each take the write lock (approximate LRU)
+        self._touched: Dict[str, float] = {}
+        self._flushed = time.monotonic()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections are not shared across forked/spawned worker processes
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{self.table}_accessed ON {self.table} (accessed)")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table}_size (id INTEGER PRIMARY KEY CHECK (id = 1), total INTEGER NOT NULL)")
+            conn.execute(
+                f"INSERT OR IGNORE INTO {self.table}_size (id, total) "
+                f"SELECT 1, COALESCE(SUM(size), 0) FROM {self.table}"
+            )
+            conn.execute("COMMIT")
+            self._conn, self._pid = conn, os.getpid()
+            self._touched = {}
+        return self._conn
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return self._connect().execute(f"SELECT total FROM {self.table}_size").fetchone()[0]
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(f"SELECT value FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_FLUSH_ROWS or time.monotonic() - self._flushed > TOUCH_FLUSH_SECONDS:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._flush_touched(conn)
+                    conn.execute("COMMIT")
+                except sqlite3.Error:
+                    conn.execute("ROLLBACK")
+                    raise
+            return row[0]
+
+    def _flush_touched(self, conn: sqlite3.Connection):
+        if self._touched:
+            conn.executemany(
+                f"UPDATE {self.table} SET accessed = MAX(accessed, ?) WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()]
+            )
+            self._touched = {}
+        self._flushed = time.monotonic()
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Recent reads count before anything is chosen for eviction
+                self._flush_touched(conn)
+                old = conn.execute(f"SELECT size FROM {self.table} WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, sqlite3.Binary(value), len(value), time.time())
+                )
+                conn.execute(
+                    f"UPDATE {self.table}_size SET total = total + ?", (len(value) - (old[0] if old else 0),)
+                )
+                total = conn.execute(f"SELECT total FROM {self.table}_size").fetchone()[0]
+                if total > self.max_bytes:
+                    self._evict(conn, total)
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, conn: sqlite3.Connection, total: int):
+        # Trim to 90% so a full cache doesn't evict on every insert
+        target = int(self.max_bytes * 0.9)
+        freed = 0
+        while total - freed > target:
+            rows = conn.execute(
+                f"SELECT key, size FROM {self.table} ORDER BY accessed ASC LIMIT 256"
+            ).fetchall()
+            if not rows:
+                freed = total
+                break
+            for key, size in rows:
+                if total - freed <= target:
+                    break
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                freed += size
+        conn.execute(f"UPDATE {self.table}_size SET total = total - ?", (freed,))
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class TieredCache:
+    """Memory LRU in front of an optional on-disk store, with hit/miss counters."""
+
+    def __init__(self, name: str, memory_bytes: int, disk_path: Optional[str] = None, disk_bytes: int = 0):
+        self.name = name
+        self.memory = LRUCache(memory_bytes)
+        self.disk = DiskCache(disk_path, name, disk_bytes) if disk_path and disk_bytes > 0 else None
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        _caches.append(self)
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits_memory += 1
+            return value
+        if self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except sqlite3.Error:
+                value = None
+            if value is not None:
+                self.hits_disk += 1
+                self.memory.set(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: bytes):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value)
+            except sqlite3.Error:
+                # The disk tier is best effort; a locked or full database must not fail a request
+                pass
+
+    def stats(self) -> Dict:
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        return {
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "hit_rate": round((self.hits_memory + self.hits_disk) / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.size,
+            "disk_entries": len(self.disk) if self.disk is not None else 0,
+            "disk_bytes": self.disk.size if self.disk is not None else 0
+        }
+
+
+def cache_stats() -> Dict[str, Dict]:
+    return {cache.name: cache.stats() for cache in _caches}
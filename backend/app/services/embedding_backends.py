@@ -0,0 +1,168 @@
+import os
+import json
+import time
+import socket
+import threading
+from typing import List, Union
+import numpy as np
+from .embedding_server import REQUEST_HEADER, RESPONSE_HEADER
+
+# ONNX Runtime implementation of the SentenceTransformer encode() contract used by scoring:
+# transformer -> attention-masked mean pooling -> optional L2 normalization.
+# Model files come from scripts/export_onnx.py (model.onnx, model_int8.onnx, tokenizer.json).
+ONNX_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))  # 0 lets ONNX Runtime decide
+SERVER_TIMEOUT = float(os.getenv("EMBEDDING_SERVER_TIMEOUT", "60"))
+# How long a worker keeps retrying before the embedding server is considered down
+SERVER_CONNECT_TIMEOUT = float(os.getenv("EMBEDDING_SERVER_CONNECT_TIMEOUT", "30"))
+
+
+class OnnxEmbeddingModel:
+    def __init__(self, model_dir: str, quantized: bool = False, max_seq_length: int = 256):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        filename = "model_int8.onnx" if quantized else "model.onnx"
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = ONNX_THREADS
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, filename), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        # The bare tokenizers library keeps torch out of the worker; transformers would import it
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_seq_length)
+        self.tokenizer.enable_padding()
+        self.max_seq_length = max_seq_length
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.session.get_outputs()[0].shape[-1]
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64)
+        }
+        feed = {name: value for name, value in inputs.items() if name in self.input_names}
+        token_embs = self.session.run(None, feed)[0]
+        mask = inputs["attention_mask"][..., None].astype(np.float32)
+        return (token_embs * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        convert_to_numpy: bool = True,
+        **kwargs
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        # Length-sorted batches keep padding small, as SentenceTransformer does
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            chunks.append(self._encode_batch([texts[i] for i in order[start:start + batch_size]]))
+        sorted_embs = np.vstack(chunks).astype(np.float32)
+        out = np.empty_like(sorted_embs)
+        out[order] = sorted_embs
+
+        if normalize_embeddings:
+            out /= np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+        return out[0] if single else out
+
+
+class RemoteEmbeddingModel:
+    """Thin client for services/embedding_server.py; one connection per thread."""
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self._local = threading.local()
+        self._namespace = None
+
+    def _connect(self) -> socket.socket:
+        deadline = time.monotonic() + SERVER_CONNECT_TIMEOUT
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(SERVER_TIMEOUT)
+            try:
+                sock.connect(self.socket_path)
+                return sock
+            except OSError:
+                sock.close()
+                # The server may still be loading the model when API workers start
+                if time.monotonic() >= deadline:
+                    raise ConnectionError(f"embedding server not reachable at {self.socket_path}")
+                time.sleep(0.5)
+
+    def _recv_exactly(self, sock: socket.socket, size: int) -> bytes:
+        buf = bytearray(size)
+        view = memoryview(buf)
+        received = 0
+        while received < size:
+            n = sock.recv_into(view[received:])
+            if n == 0:
+                raise ConnectionError("embedding server closed the connection")
+            received += n
+        return bytes(buf)
+
+    def _request(self, sock: socket.socket, texts: List[str]) -> np.ndarray:
+        payload = json.dumps(texts).encode("utf-8")
+        sock.sendall(REQUEST_HEADER.pack(len(payload)) + payload)
+        rows, dim = RESPONSE_HEADER.unpack(self._recv_exactly(sock, RESPONSE_HEADER.size))
+        if rows < 0:
+            raise RuntimeError(self._recv_exactly(sock, dim).decode("utf-8"))
+        data = self._recv_exactly(sock, rows * dim * 4)
+        return np.frombuffer(data, dtype="<f4").reshape(rows, dim).astype(np.float32)
+
+    def _request_info(self, sock: socket.socket) -> dict:
+        payload = json.dumps({"op": "info"}).encode("utf-8")
+        sock.sendall(REQUEST_HEADER.pack(len(payload)) + payload)
+        kind, size = RESPONSE_HEADER.unpack(self._recv_exactly(sock, RESPONSE_HEADER.size))
+        data = self._recv_exactly(sock, size).decode("utf-8")
+        if kind != -2:
+            raise RuntimeError(data)
+        return json.loads(data)
+
+    def _call(self, request, *args):
+        # One retry on a fresh connection covers a server restart between requests
+        for attempt in range(2):
+            sock = getattr(self._local, "sock", None)
+            if sock is None:
+                sock = self._local.sock = self._connect()
+            try:
+                return request(sock, *args)
+            except (OSError, ConnectionError):
+                sock.close()
+                self._local.sock = None
+                # The restarted server may run another model or backend
+                self._namespace = None
+                if attempt:
+                    raise
+
+    @property
+    def namespace(self) -> str:
+        # The server's model/backend, which the vectors it returns belong to
+        if self._namespace is None:
+            self._namespace = self._call(self._request_info)["namespace"]
+        return self._namespace
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        convert_to_numpy: bool = True,
+        **kwargs
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        out = self._call(self._request, texts)
+        if normalize_embeddings:
+            out /= np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+        return out[0] if single else out
@@ -0,0 +1,104 @@
+import os
+import json
+import struct
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+import numpy as np
+from .batching import MicroBatcher
+from .model_registry import EMBEDDING_CACHE_NAMESPACE, build_local_embedding_model
+
+# One process owns the embedding model and serves every API worker on the node over a Unix
+# socket, so `uvicorn --workers N` holds one copy of the weights instead of N. Concurrent
+# requests from all workers are micro-batched into shared forward passes.
+#
+#   python -m backend.app.services.embedding_server --socket /tmp/embeddings.sock
+#   EMBEDDING_SERVER_SOCKET=/tmp/embeddings.sock uvicorn backend.app.main:app --workers 8
+#
+# Wire format, both directions prefixed with network-order ints:
+#   request:  !I payload length, then a UTF-8 JSON list of texts, or {"op": "info"}
+#   response: !ii rows, dim, then rows*dim little-endian float32 (unnormalized)
+#             or rows == -1, dim == message length, then a UTF-8 error message
+#             or rows == -2, dim == length, then UTF-8 JSON {"namespace", "dim"} (info)
+SERVER_MAX_BATCH = int(os.getenv("EMBEDDING_SERVER_MAX_BATCH", "64"))
+SERVER_WINDOW_MS = float(os.getenv("EMBEDDING_SERVER_WINDOW_MS", "5"))
+
+REQUEST_HEADER = struct.Struct("!I")
+RESPONSE_HEADER = struct.Struct("!ii")
+
+
+def encode_response(embs: np.ndarray) -> bytes:
+    embs = np.ascontiguousarray(embs, dtype="<f4")
+    return RESPONSE_HEADER.pack(*embs.shape) + embs.tobytes()
+
+
+def encode_error(message: str) -> bytes:
+    data = message.encode("utf-8")
+    return RESPONSE_HEADER.pack(-1, len(data)) + data
+
+
+def encode_info(info: dict) -> bytes:
+    data = json.dumps(info).encode("utf-8")
+    return RESPONSE_HEADER.pack(-2, len(data)) + data
+
+
+class EmbeddingServer:
+    def __init__(self, socket_path: str, max_batch: int = SERVER_MAX_BATCH, window_ms: float = SERVER_WINDOW_MS):
+        self.socket_path = socket_path
+        self.model = build_local_embedding_model()
+        self.dim = self.model.get_sentence_embedding_dimension()
+        # A single encoder thread: the model is never run concurrently with itself
+        self.batcher = MicroBatcher(
+            self._encode, max_batch, window_ms, ThreadPoolExecutor(max_workers=1), name="embedding_server"
+        )
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, batch_size=SERVER_MAX_BATCH, convert_to_numpy=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                (length,) = REQUEST_HEADER.unpack(await reader.readexactly(REQUEST_HEADER.size))
+                texts = json.loads(await reader.readexactly(length))
+                if isinstance(texts, dict):
+                    # Clients key their caches and stored vectors by the server's model/backend
+                    writer.write(encode_info({"namespace": EMBEDDING_CACHE_NAMESPACE, "dim": self.dim}))
+                    await writer.drain()
+                    continue
+                try:
+                    embs = await self.batcher.submit(texts) if texts else np.zeros((0, self.dim))
+                    writer.write(encode_response(embs))
+                except Exception as e:
+                    writer.write(encode_error(f"{type(e).__name__}: {e}"))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self.handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        print(f"embedding server listening on {self.socket_path} (dim={self.dim})", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.batcher.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the embedding model to local API workers")
+    parser.add_argument("--socket", default=os.getenv("EMBEDDING_SERVER_SOCKET", "/tmp/resume-embeddings.sock"))
+    parser.add_argument("--max-batch", type=int, default=SERVER_MAX_BATCH)
+    parser.add_argument("--window-ms", type=float, default=SERVER_WINDOW_MS)
+    args = parser.parse_args()
+    try:
+        asyncio.run(EmbeddingServer(args.socket, args.max_batch, args.window_ms).serve())
+    except KeyboardInterrupt:
+        pass
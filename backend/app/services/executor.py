@@ -0,0 +1,125 @@
+import os
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+# CPU-bound work (PDF parsing, fuzzy matching) goes to a process pool so it can't stall the
+# event loop; blocking I/O (LLM calls, DB commits) goes to a thread pool. Model encoding runs on
+# its own thread pool in this process (torch releases the GIL), so the model is loaded once per
+# API process rather than once per pool worker, and the caches in front of it stay here too.
+CPU_POOL_MODE = os.getenv("CPU_POOL_MODE", "process")  # "process" or "thread"
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", str(os.cpu_count() or 1)))
+IO_POOL_WORKERS = int(os.getenv("IO_POOL_WORKERS", "16"))
+ENCODE_POOL_WORKERS = int(os.getenv("ENCODE_POOL_WORKERS", str(min(CPU_POOL_WORKERS, 4))))
+MAX_PENDING_TASKS = int(os.getenv("MAX_PENDING_TASKS", str(CPU_POOL_WORKERS * 4)))
+QUEUE_TIMEOUT = float(os.getenv("EXECUTOR_QUEUE_TIMEOUT", "2"))
+
+_cpu_pool: Optional[Executor] = None
+_io_pool: Optional[ThreadPoolExecutor] = None
+_encode_pool: Optional[ThreadPoolExecutor] = None
+_slots: Optional[asyncio.Semaphore] = None
+_slots_loop = None
+
+
+class ExecutorSaturated(RuntimeError):
+    pass
+
+
+def _init_worker():
+    # One torch/BLAS thread per worker process; the pool itself provides the parallelism
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    os.environ.setdefault("MKL_NUM_THREADS", "1")
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    # Import the parsing and matching code up front instead of on each worker's first task
+    from . import parsing, resume_matching  # noqa: F401
+
+
+def get_cpu_pool() -> Executor:
+    global _cpu_pool
+    if _cpu_pool is None:
+        if CPU_POOL_MODE == "thread":
+            _cpu_pool = ThreadPoolExecutor(max_workers=CPU_POOL_WORKERS, thread_name_prefix="cpu")
+        else:
+            # spawn, not fork: forking a process that already holds torch threads can deadlock
+            _cpu_pool = ProcessPoolExecutor(
+                max_workers=CPU_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+    return _cpu_pool
+
+
+def get_io_pool() -> ThreadPoolExecutor:
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS, thread_name_prefix="io")
+    return _io_pool
+
+
+def _get_slots() -> asyncio.Semaphore:
+    global _slots, _slots_loop
+    loop = asyncio.get_running_loop()
+    if _slots is None or _slots_loop is not loop:
+        _slots, _slots_loop = asyncio.Semaphore(MAX_PENDING_TASKS), loop
+    return _slots
+
+
+async def run_cpu(fn: Callable, *args, **kwargs):
+    # Backpressure: wait briefly for a slot, then reject instead of queueing without bound
+    slots = _get_slots()
+    try:
+        await asyncio.wait_for(slots.acquire(), timeout=QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise ExecutorSaturated(f"{MAX_PENDING_TASKS} CPU tasks already pending")
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_cpu_pool(), functools.partial(fn, *args, **kwargs))
+    finally:
+        slots.release()
+
+
+async def run_io(fn: Callable, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_pool(), functools.partial(fn, *args, **kwargs))
+
+
+def get_encode_pool() -> ThreadPoolExecutor:
+    global _encode_pool
+    if _encode_pool is None:
+        _encode_pool = ThreadPoolExecutor(max_workers=ENCODE_POOL_WORKERS, thread_name_prefix="encode")
+    return _encode_pool
+
+
+async def run_encode(fn: Callable, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_encode_pool(), functools.partial(fn, *args, **kwargs))
+
+
+def _apply_chunk(fn: Callable, chunk: Sequence[tuple]) -> list:
+    return [fn(*args) for args in chunk]
+
+
+async def map_cpu(fn: Callable, items: Sequence[tuple]) -> List:
+    # Large batches are split into one chunk per worker so they take a handful of
+    # slots rather than one per item
+    if not items:
+        return []
+    size = max(1, -(-len(items) // CPU_POOL_WORKERS))
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    results = await asyncio.gather(*(run_cpu(_apply_chunk, fn, chunk) for chunk in chunks))
+    return [result for chunk in results for result in chunk]
+
+
+def shutdown():
+    global _cpu_pool, _io_pool, _encode_pool
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=False, cancel_futures=True)
+        _cpu_pool = None
+    if _io_pool is not None:
+        _io_pool.shutdown(wait=False, cancel_futures=True)
+        _io_pool = None
+    if _encode_pool is not None:
+        _encode_pool.shutdown(wait=False, cancel_futures=True)
+        _encode_pool = None
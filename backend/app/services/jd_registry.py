@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.exc import IntegrityError
+from backend.app.db.session import SessionLocal
+from backend.app.models.job_description import JobDescription
+from .executor import run_cpu, run_io
+from .jd_structuring import STRUCTURING_VERSION, jd_structuring, restructure
+from .parsing import aextract_text
+from .model_registry import embedding_namespace
+from .scoring import aencode_texts, semantic_inputs
+
+# Structured JDs are stored by content hash together with their embeddings. Evaluating against a
+# known JD, by jd_id or by uploading the same file again, skips parsing, structuring and encoding.
+# Rows structured by another STRUCTURING_VERSION or encoded by another model/backend are brought
+# up to date on first use.
+
+
+# Registrations in progress by content hash, so concurrent uploads of one JD parse it once
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+class JobDescriptionError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def requirement_queries(raw_text: str, jd_struct: Dict) -> List[str]:
+    # The texts the chunked semantic mode aligns resumes against
+    return semantic_inputs(raw_text, [], jd_struct["must_have"], mode="chunked")[0]
+
+
+def _to_record(jd: JobDescription) -> Dict:
+    embedding = requirement_embs = None
+    current = jd.structuring_version == STRUCTURING_VERSION
+    # Vectors from another model or backend, or of outdated requirements, get recomputed on first use
+    if current and jd.embedding_model == embedding_namespace() and jd.embedding:
+        embedding = np.frombuffer(jd.embedding, dtype=np.float32)
+        if jd.requirement_embeddings is not None:
+            requirement_embs = np.frombuffer(jd.requirement_embeddings, dtype=np.float32).reshape(-1, len(embedding))
+    return {
+        "id": jd.id,
+        "filename": jd.filename,
+        "raw_text": jd.raw_text,
+        "struct": jd.structured if current else None,
+        "embedding": embedding,
+        "requirement_embeddings": requirement_embs
+    }
+
+
+def load_jd(jd_id: int) -> Optional[Dict]:
+    db = SessionLocal()
+    try:
+        jd = db.get(JobDescription, jd_id)
+        return _to_record(jd) if jd is not None else None
+    finally:
+        db.close()
+
+
+def find_jd(content_hash: str) -> Optional[Dict]:
+    db = SessionLocal()
+    try:
+        jd = db.query(JobDescription).filter(JobDescription.content_hash == content_hash).first()
+        return _to_record(jd) if jd is not None else None
+    finally:
+        db.close()
+
+
+def save_jd(
+    content_hash: str,
+    filename: str,
+    raw_text: str,
+    jd_struct: Dict,
+    embedding: np.ndarray,
+    requirement_embs: np.ndarray
+) -> Dict:
+    db = SessionLocal()
+    try:
+        jd = JobDescription(
+            content_hash=content_hash,
+            filename=filename,
+            raw_text=raw_text,
+            title=jd_struct["title"],
+            structured=jd_struct,
+            structuring_version=STRUCTURING_VERSION,
+            embedding_model=embedding_namespace(),
+            embedding=embedding.astype(np.float32).tobytes(),
+            requirement_embeddings=requirement_embs.astype(np.float32).tobytes()
+        )
+        db.add(jd)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another request registered the same JD first
+            db.rollback()
+            return find_jd(content_hash)
+        return _to_record(jd)
+    finally:
+        db.close()
+
+
+def update_embeddings(jd_id: int, embedding: np.ndarray, requirement_embs: np.ndarray):
+    db = SessionLocal()
+    try:
+        db.query(JobDescription).filter(JobDescription.id == jd_id).update({
+            JobDescription.embedding_model: embedding_namespace(),
+            JobDescription.embedding: embedding.astype(np.float32).tobytes(),
+            JobDescription.requirement_embeddings: requirement_embs.astype(np.float32).tobytes()
+        })
+        db.commit()
+    finally:
+        db.close()
+
+
+def update_structure(jd_id: int, jd_struct: Dict):
+    db = SessionLocal()
+    try:
+        db.query(JobDescription).filter(JobDescription.id == jd_id).update({
+            JobDescription.title: jd_struct["title"],
+            JobDescription.structured: jd_struct,
+            JobDescription.structuring_version: STRUCTURING_VERSION
+        })
+        db.commit()
+    finally:
+        db.close()
+
+
+async def embed_jd(raw_text: str, jd_struct: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    # The whole JD (blob mode) and its requirement queries (chunked mode) in one encode
+    queries = requirement_queries(raw_text, jd_struct)
+    embs = await aencode_texts([raw_text] + queries)
+    return embs[0], embs[1:]
+
+
+async def refresh_jd(record: Dict) -> Dict:
+    if record["struct"] is None:
+        record["struct"] = await run_cpu(restructure, record["raw_text"])
+        await run_io(update_structure, record["id"], record["struct"])
+    if record["embedding"] is None:
+        record["embedding"], record["requirement_embeddings"] = await embed_jd(record["raw_text"], record["struct"])
+        await run_io(update_embeddings, record["id"], record["embedding"], record["requirement_embeddings"])
+    return record
+
+
+async def register_jd(filename: str, content: bytes) -> Optional[Dict]:
+    # None when no text could be extracted from the file
+    content_hash = hashlib.sha256(content).hexdigest()
+    task = _inflight.get(content_hash)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = _inflight[content_hash] = asyncio.ensure_future(_register(content_hash, filename, content))
+        task.add_done_callback(lambda t: _inflight.pop(content_hash) if _inflight.get(content_hash) is t else None)
+    record = await asyncio.shield(task)
+    # Callers share the task's record; hand each its own copy
+    return dict(record) if record is not None else None
+
+
+async def _register(content_hash: str, filename: str, content: bytes) -> Optional[Dict]:
+    record = await run_io(find_jd, content_hash)
+    if record is None:
+        result = await aextract_text(filename, content)
+        if not result.get("raw_text"):
+            return None
+        jd_struct = await run_cpu(jd_structuring, result["raw_text"], result["sections"])
+        embedding, requirement_embs = await embed_jd(result["raw_text"], jd_struct)
+        record = await run_io(
+            save_jd, content_hash, filename, result["raw_text"], jd_struct, embedding, requirement_embs
+        )
+    return await refresh_jd(record)
+
+
+async def resolve_jd(jd_id: Optional[int], filename: Optional[str] = None, content: Optional[bytes] = None) -> Dict:
+    if jd_id is not None:
+        record = await run_io(load_jd, jd_id)
+        if record is None:
+            raise JobDescriptionError(404, f"Job description {jd_id} not found.")
+        return await refresh_jd(record)
+    if content is None:
+        raise JobDescriptionError(400, "Provide either jd_file or jd_id.")
+    record = await register_jd(filename, content)
+    if record is None:
+        raise JobDescriptionError(400, "Failed to extract text from JD file.")
+    return record
@@ -1,8 +1,13 @@
 import re
 from typing import Dict, List
+from .parsing import heuristic_section_split
+from .skill_taxonomy import TAXONOMY_FINGERPRINT, skill_index
 
 DEGREE_KEYWORDS = ["bachelor", "master", "b.tech", "btech", "m.tech", "mtech", "be", "me", "bsc", "msc", "mca"]
 YEARS_PAT = re.compile(r"(\d+)\+?\s+(years?|yrs?)", re.I)
+# Stored structured JDs from another version are re-derived from their raw text. Bump the
+# number when the heuristics below change; taxonomy edits are picked up by the fingerprint
+STRUCTURING_VERSION = f"1/{TAXONOMY_FINGERPRINT}"
 
 def split_bullets(text: str) -> List[str]:
     items = re.split(r"\n[-•*]\s+|\r\n[-•*]\s+|\n\d+\.\s+", text)
@@ -44,10 +49,22 @@ def jd_structuring(raw_text: str, sections: Dict[str, str]) -> Dict:
     # Degrees
     degrees = [d for d in DEGREE_KEYWORDS if d in text_low]
 
+    # Canonical skill IDs mentioned in the requirement bullets
+    must_have, nice_to_have = must_have[:20], nice_to_have[:20]
+    must_have_skills = skill_index.extract("\n".join(must_have))
+    nice_to_have_skills = skill_index.extract("\n".join(nice_to_have)) - must_have_skills
+
     return {
         "title": extract_title(raw_text),
-        "must_have": must_have[:20],
-        "nice_to_have": nice_to_have[:20],
+        "must_have": must_have,
+        "nice_to_have": nice_to_have,
+        "must_have_skills": sorted(must_have_skills),
+        "nice_to_have_skills": sorted(nice_to_have_skills),
         "years_required": years_required,
         "degrees": degrees
-    }
\ No newline at end of file
+    }
+
+
+def restructure(raw_text: str) -> Dict:
+    # Registered JDs keep only their raw text; the sections are split the way parsing does
+    return jd_structuring(raw_text, heuristic_section_split(raw_text))
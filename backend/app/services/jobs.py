@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List, Set, Tuple
+from backend.app.db.session import SessionLocal
+from backend.app.models.evaluation import ResumeEvaluation
+from .executor import run_io
+from .suggestions import agenerate_suggestions, failed_suggestions
+
+# Suggestions for evaluations created in job mode are filled in here after the
+# score has already been returned; waiters in this process are woken through an Event
+_events: Dict[int, asyncio.Event] = {}
+_tasks: Set[asyncio.Task] = set()
+logger = logging.getLogger(__name__)
+
+
+def update_suggestions(record_id: int, suggestions: dict, status: str):
+    db = SessionLocal()
+    try:
+        db.query(ResumeEvaluation).filter(ResumeEvaluation.id == record_id).update(
+            {"suggestions": suggestions, "suggestions_status": status}
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _fill_suggestions(record_id: int, missing_skills: list, role: str, score: float):
+    try:
+        suggestions = await agenerate_suggestions(missing_skills=missing_skills, role=role, score=score)
+        status = "failed" if suggestions.get("error") else "ready"
+    except Exception as e:
+        suggestions, status = failed_suggestions(e), "failed"
+    try:
+        await run_io(update_suggestions, record_id, suggestions, status)
+    finally:
+        event = _events.pop(record_id, None)
+        if event is not None:
+            event.set()
+
+
+def _track(task: asyncio.Task):
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def schedule_suggestions(record_id: int, missing_skills: list, role: str, score: float):
+    _events[record_id] = asyncio.Event()
+    _track(asyncio.create_task(_fill_suggestions(record_id, missing_skills, role, score)))
+
+
+def load_pending() -> List[Tuple[int, list, str, float]]:
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(ResumeEvaluation.id, ResumeEvaluation.missing_must_have, ResumeEvaluation.jd_title, ResumeEvaluation.score)
+            .filter(ResumeEvaluation.suggestions_status == "pending")
+            .order_by(ResumeEvaluation.id)
+            .all()
+        )
+        return [(r.id, r.missing_must_have or [], r.jd_title, r.score) for r in rows]
+    finally:
+        db.close()
+
+
+async def resume_pending() -> int:
+    # Jobs only live in memory, so rows a previous process left pending are scheduled again.
+    # Another worker booting at the same time may pick up the same rows; both write the same
+    # result and the second LLM call is usually a suggestion cache hit
+    pending = await run_io(load_pending)
+    for record_id, missing_skills, role, score in pending:
+        schedule_suggestions(record_id, missing_skills, role, score)
+    return len(pending)
+
+
+async def _run_quietly(fn: Callable, *args):
+    try:
+        await run_io(fn, *args)
+    except Exception:
+        logger.exception("Background task %s failed", getattr(fn, "__name__", fn))
+
+
+def run_in_background(fn: Callable, *args):
+    # Best-effort follow-up work (e.g. indexing) that must not fail or delay the response
+    _track(asyncio.create_task(_run_quietly(fn, *args)))
+
+
+async def wait_for_suggestions(record_id: int, timeout: float) -> bool:
+    # Jobs started by another worker process have no local Event; callers re-check the DB
+    event = _events.get(record_id)
+    if event is None:
+        await asyncio.sleep(timeout)
+        return False
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+async def drain(timeout: float = 30.0):
+    if _tasks:
+        await asyncio.wait(list(_tasks), timeout=timeout)
@@ -0,0 +1,132 @@
+import os
+import re
+import time
+import asyncio
+import threading
+from typing import Dict, Optional
+from dotenv import load_dotenv
+from langchain_core.messages import AIMessage
+
+# Heavy models are built on first use rather than at import, once per process, and shared by
+# the scoring service, the suggestion service and the LangGraph pipeline. The app's lifespan
+# can warm them up in the background while /health/ready reports "warming".
+load_dotenv()
+
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+# "torch" (SentenceTransformer), "onnx" or "onnx-int8" (ONNX Runtime, see scripts/export_onnx.py)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR", f"./onnx/{EMBEDDING_MODEL_NAME}")
+# When set, the model lives in services/embedding_server.py and this process is a thin client
+EMBEDDING_SERVER_SOCKET = os.getenv("EMBEDDING_SERVER_SOCKET")
+# Backends drift slightly from each other, so cached vectors are kept apart per backend.
+# This is the local configuration; with an embedding server, use embedding_namespace()
+EMBEDDING_CACHE_NAMESPACE = f"{EMBEDDING_MODEL_NAME}/{EMBEDDING_BACKEND}"
+# "gemini" for the real model, "stub" for an offline canned model (tests, benchmarks)
+SUGGESTION_MODEL = os.getenv("SUGGESTION_MODEL", "gemini")
+
+_lock = threading.Lock()
+_models: Dict[str, object] = {}
+_state = {"status": "cold", "error": None}
+
+STUB_RESPONSE = """Resume Fixes:
+* Lead each experience bullet with a measurable outcome.
+
+Skills to Add:
+* {skills}
+
+Experience Suggestions:
+* Build a small project that uses the missing skills end to end.
+
+"""
+
+
+class StubChatModel:
+    """Local stand-in for the Gemini client with an optional simulated latency."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def _respond(self, prompt: str) -> AIMessage:
+        match = re.search(r"missing: (.*?)\.\n", prompt)
+        return AIMessage(content=STUB_RESPONSE.format(skills=match.group(1) if match else "None"))
+
+    def invoke(self, prompt: str) -> AIMessage:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(prompt)
+
+    async def ainvoke(self, prompt: str) -> AIMessage:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(prompt)
+
+
+def build_local_embedding_model():
+    if EMBEDDING_BACKEND in ("onnx", "onnx-int8"):
+        from .embedding_backends import OnnxEmbeddingModel
+        return OnnxEmbeddingModel(EMBEDDING_ONNX_DIR, quantized=EMBEDDING_BACKEND == "onnx-int8")
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+
+def _build_embedding_model():
+    if EMBEDDING_SERVER_SOCKET:
+        from .embedding_backends import RemoteEmbeddingModel
+        return RemoteEmbeddingModel(EMBEDDING_SERVER_SOCKET)
+    return build_local_embedding_model()
+
+
+def _build_chat_model():
+    if SUGGESTION_MODEL == "stub":
+        return StubChatModel(latency=float(os.getenv("STUB_MODEL_LATENCY", "0")))
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.0-flash",
+        temperature=0.1,
+        max_output_tokens=1000,
+        google_api_key=os.getenv("GEMINI_API_KEY")
+    )
+
+
+def _get(name: str, build):
+    model = _models.get(name)
+    if model is None:
+        with _lock:
+            model = _models.get(name)
+            if model is None:
+                model = _models[name] = build()
+    return model
+
+
+def get_embedding_model():
+    return _get("embedding", _build_embedding_model)
+
+
+def embedding_namespace() -> str:
+    # Model/backend that produced the vectors: the embedding server's when one is in use
+    if EMBEDDING_SERVER_SOCKET:
+        return get_embedding_model().namespace
+    return EMBEDDING_CACHE_NAMESPACE
+
+
+def get_chat_model():
+    return _get("chat", _build_chat_model)
+
+
+def set_chat_model(model):
+    _models["chat"] = model
+
+
+def warm_up():
+    get_embedding_model().encode(["warm up"])
+    get_chat_model()
+
+
+def set_status(status: str, error: Optional[str] = None):
+    _state["status"], _state["error"] = status, error
+
+
+def readiness() -> Dict:
+    # Without a warm-up the process is ready as soon as it serves; models load on first use
+    status = "ready" if _state["status"] == "cold" else _state["status"]
+    return {"status": status, "error": _state["error"], "loaded": sorted(_models)}
@@ -1,9 +1,32 @@
 import io
+import os
 import re
-from typing import Dict, Optional
+import json
+import time
+import hashlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 import pdfplumber
 import fitz  
 import docx2txt
+from .cache import MB, TieredCache
+from .executor import map_cpu, run_io
+
+# Identical uploads (same bytes) reuse the previous parse instead of re-running pdfplumber
+parse_cache = TieredCache(
+    "parsed_documents",
+    memory_bytes=int(os.getenv("PARSE_CACHE_MEMORY_MB", "32")) * MB,
+    disk_path=os.getenv("PARSE_CACHE_PATH", "./parse_cache.db"),
+    disk_bytes=int(os.getenv("PARSE_CACHE_DISK_MB", "256")) * MB
+)
+
+# PDF extraction strategy: "fast" (PyMuPDF, pdfplumber only when the quality check fails) or
+# "accurate" (pdfplumber, PyMuPDF only when it returns almost nothing), which is an opt-in:
+# the quality check already sends layouts PyMuPDF flattens to pdfplumber
+PDF_EXTRACT_STRATEGY = os.getenv("PDF_EXTRACT_STRATEGY", "fast")
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "30"))
+# Wall-time budget for one document, shared by the primary extractor and its fallback
+PDF_TIMEOUT = float(os.getenv("PDF_TIMEOUT", "10"))
+MIN_CHARS_PER_PAGE = 100
 
 SECTION_HEADERS = [
     "summary", "objective", "skills", "technical skills", "experience",
@@ -18,26 +41,87 @@ def clean_text(text: str) -> str:
     text = text.strip()
     return text
 
-def extract_text_pdfplumber(file_bytes: bytes) -> Optional[str]:
+def pdf_deadline() -> float:
+    return time.monotonic() + PDF_TIMEOUT
+
+def read_pages(pages: Iterable, extract_page: Callable, deadline: float) -> List[str]:
+    # Extraction can't be interrupted mid-page, so the deadline is checked before each page:
+    # a slow page can overrun it once, after which the rest of the document is skipped
+    texts = []
+    for page in pages:
+        if time.monotonic() > deadline:
+            break
+        texts.append(extract_page(page) or "")
+    return texts
+
+def extract_text_pdfplumber(file_bytes: bytes, max_pages: int = PDF_MAX_PAGES, deadline: float = None) -> Optional[str]:
+    deadline = deadline or pdf_deadline()
     try:
         with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-            pages = [page.extract_text(x_tolerance=1, y_tolerance=1) or "" for page in pdf.pages]
+            pages = read_pages(
+                pdf.pages[:max_pages],
+                lambda page: page.extract_text(x_tolerance=1, y_tolerance=1),
+                deadline
+            )
         text = "\n".join(pages)
         return clean_text(text)
     except Exception:
         return None
 
-def extract_text_pymupdf(file_bytes: bytes) -> Optional[str]:
+def extract_text_pymupdf(file_bytes: bytes, max_pages: int = PDF_MAX_PAGES, deadline: float = None) -> Optional[str]:
+    deadline = deadline or pdf_deadline()
     try:
-        doc = fitz.open(stream=file_bytes, filetype="pdf")
-        blocks = []
-        for page in doc:
-            blocks.append(page.get_text("text"))
+        with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+            pages = (doc.load_page(i) for i in range(min(doc.page_count, max_pages)))
+            blocks = read_pages(pages, lambda page: page.get_text("text", sort=True), deadline)
         text = "\n".join(blocks)
         return clean_text(text)
     except Exception:
         return None
 
+def pdf_page_count(file_bytes: bytes) -> int:
+    try:
+        with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+            return doc.page_count
+    except Exception:
+        return 0
+
+def text_quality_ok(text: str, page_count: int) -> bool:
+    if not text or len(text) < MIN_CHARS_PER_PAGE * max(min(page_count, PDF_MAX_PAGES), 1):
+        return False
+    # Undecodable glyphs ("(cid:12)", U+FFFD) point at a font PyMuPDF couldn't map
+    if text.count("\ufffd") + text.count("(cid:") > len(text) * 0.01:
+        return False
+    readable = sum(1 for ch in text if ch.isalnum() or ch.isspace() or ch in ".,;:()-/+&@#%|*'\"•")
+    if readable / len(text) < 0.9:
+        return False
+    # Lost line structure means columns or tables were flattened into one run
+    lines = [ln for ln in text.splitlines() if ln.strip()]
+    return len(lines) > 1 and len(text) / len(lines) < 200
+
+def extract_text_pdf(file_bytes: bytes, strategy: str = PDF_EXTRACT_STRATEGY) -> str:
+    deadline = pdf_deadline()
+    page_count = pdf_page_count(file_bytes)
+    if strategy != "accurate":
+        text = extract_text_pymupdf(file_bytes, deadline=deadline)
+        # No text layer at all (a scanned PDF): pdfplumber reads the same layer, so don't retry
+        if text is not None and not text:
+            return ""
+        text = text or ""
+        if not text_quality_ok(text, page_count) and time.monotonic() < deadline:
+            fallback = extract_text_pdfplumber(file_bytes, deadline=deadline) or ""
+            if len(fallback) > len(text):
+                text = fallback
+        return text
+
+    text = extract_text_pdfplumber(file_bytes, deadline=deadline)
+    if text is not None and not text:
+        return ""
+    text = text or ""
+    if len(text) < 50 and time.monotonic() < deadline:
+        text = extract_text_pymupdf(file_bytes, deadline=deadline) or text
+    return text
+
 def extract_text_docx(file_bytes: bytes) -> Optional[str]:
     try:
         text = docx2txt.process(io.BytesIO(file_bytes))
@@ -78,13 +162,52 @@ def heuristic_section_split(text: str) -> Dict[str, str]:
         sections["skills"] = sections["technical_skills"]
     return sections
 
-def extract_text(filename: str, file_bytes: bytes) -> Dict:
+def document_key(ftype: str, file_bytes: bytes, strategy: str) -> str:
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    return f"{ftype}:{strategy}:{digest}" if ftype == "pdf" else f"{ftype}:{digest}"
+
+def extract_text(filename: str, file_bytes: bytes, strategy: str = None) -> Dict:
     ftype = detect_filetype(filename)
+    strategy = strategy or PDF_EXTRACT_STRATEGY
+    key = document_key(ftype, file_bytes, strategy)
+    cached = parse_cache.get(key)
+    if cached is not None:
+        return json.loads(cached)
+
+    result = parse_document(ftype, file_bytes, strategy)
+    if result["raw_text"]:
+        parse_cache.set(key, json.dumps(result).encode("utf-8"))
+    return result
+
+def _lookup_parsed(keys: List[str]) -> List[Optional[Dict]]:
+    return [json.loads(cached) if cached is not None else None for cached in map(parse_cache.get, keys)]
+
+def _store_parsed(entries: List[Tuple[str, Dict]]):
+    for key, result in entries:
+        if result["raw_text"]:
+            parse_cache.set(key, json.dumps(result).encode("utf-8"))
+
+async def aextract_many(items: List[Tuple[str, bytes]], strategy: str = None) -> List[Dict]:
+    # Cache lookups (and their hit/miss counts) stay in this process; only misses are
+    # parsed on the CPU pool
+    strategy = strategy or PDF_EXTRACT_STRATEGY
+    ftypes = [detect_filetype(filename) for filename, _ in items]
+    keys = await run_io(lambda: [document_key(ftype, content, strategy) for ftype, (_, content) in zip(ftypes, items)])
+    results = await run_io(_lookup_parsed, keys)
+    misses = [i for i, result in enumerate(results) if result is None]
+    parsed = await map_cpu(parse_document, [(ftypes[i], items[i][1], strategy) for i in misses])
+    for i, result in zip(misses, parsed):
+        results[i] = result
+    await run_io(_store_parsed, [(keys[i], results[i]) for i in misses])
+    return results
+
+async def aextract_text(filename: str, file_bytes: bytes, strategy: str = None) -> Dict:
+    return (await aextract_many([(filename, file_bytes)], strategy))[0]
+
+def parse_document(ftype: str, file_bytes: bytes, strategy: str = PDF_EXTRACT_STRATEGY) -> Dict:
     text = ""
     if ftype == "pdf":
-        text = extract_text_pdfplumber(file_bytes) or ""
-        if len(text) < 50:
-            text = extract_text_pymupdf(file_bytes) or ""
+        text = extract_text_pdf(file_bytes, strategy)
     elif ftype == "docx":
         text = extract_text_docx(file_bytes) or ""
     else:
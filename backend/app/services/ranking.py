@@ -0,0 +1,104 @@
+import os
+import time
+import asyncio
+from typing import Dict, List
+import numpy as np
+from .executor import run_cpu, run_io
+from .resume_matching import compute_hard_match_many
+from .scoring import acompute_semantic_similarity_many, compute_score
+from .suggestions import agenerate_suggestions
+from .vector_index import resume_index, load_document_sections
+
+# Retrieve-then-rerank over the stored resume pool:
+#   1. shortlist: cosine over precomputed embeddings + must-have skill overlap (vectorized)
+#   2. rerank:    full hard match + semantic scoring on the shortlist only
+#   3. suggest:   LLM suggestions for the finalists only
+SHORTLIST_SIZE = int(os.getenv("RANK_SHORTLIST_SIZE", "200"))
+RESULTS_SIZE = int(os.getenv("RANK_RESULTS_SIZE", "20"))
+SUGGESTIONS_SIZE = int(os.getenv("RANK_SUGGESTIONS_SIZE", "5"))
+SHORTLIST_SEMANTIC_WEIGHT = float(os.getenv("RANK_SHORTLIST_SEMANTIC_WEIGHT", "0.5"))
+SHORTLIST_MIN_SCORE = float(os.getenv("RANK_SHORTLIST_MIN_SCORE", "0.0"))
+# Upper bounds on the per-request sizes; every finalist costs an LLM call
+MAX_SHORTLIST_SIZE = int(os.getenv("RANK_MAX_SHORTLIST_SIZE", "2000"))
+MAX_RESULTS_SIZE = int(os.getenv("RANK_MAX_RESULTS_SIZE", "200"))
+MAX_SUGGESTIONS_SIZE = int(os.getenv("RANK_MAX_SUGGESTIONS_SIZE", "20"))
+
+
+def _ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+async def rank_candidates(
+    jd_text: str,
+    jd_struct: Dict,
+    jd_emb: np.ndarray,
+    requirement_embs: np.ndarray = None,
+    shortlist_size: int = SHORTLIST_SIZE,
+    results_size: int = RESULTS_SIZE,
+    suggestions_size: int = SUGGESTIONS_SIZE,
+    min_shortlist_score: float = SHORTLIST_MIN_SCORE
+) -> Dict:
+    timings = {}
+
+    # Stage 1: shortlist
+    start = time.perf_counter()
+    shortlist = await run_io(
+        resume_index.shortlist, jd_emb, jd_struct.get("must_have_skills", []),
+        shortlist_size, SHORTLIST_SEMANTIC_WEIGHT, min_shortlist_score
+    )
+    timings["shortlist_ms"] = _ms(start)
+
+    # Stage 2: full scoring on the shortlist
+    start = time.perf_counter()
+    docs = await run_io(load_document_sections, [doc_id for doc_id, _, _, _ in shortlist])
+    shortlist = [entry for entry in shortlist if entry[0] in docs]
+    sections_list = [docs[doc_id]["sections"] for doc_id, _, _, _ in shortlist]
+    semantic_scores, features_list = await asyncio.gather(
+        acompute_semantic_similarity_many(
+            jd_text, sections_list,
+            jd_emb=jd_emb, jd_requirements=jd_struct["must_have"], requirement_embs=requirement_embs
+        ),
+        run_cpu(compute_hard_match_many, jd_struct, sections_list)
+    )
+    ranked: List[Dict] = []
+    for (doc_id, stage1_score, _, overlap), semantic_score, features in zip(shortlist, semantic_scores, features_list):
+        features["semantic_similarity"] = semantic_score
+        score_result = compute_score(features)
+        ranked.append({
+            "document_id": doc_id,
+            "resume_filename": docs[doc_id]["resume_filename"],
+            "evaluation_id": docs[doc_id]["evaluation_id"],
+            "shortlist_score": stage1_score,
+            "skill_overlap": overlap,
+            "score": score_result["final_score"],
+            "verdict": score_result["verdict"],
+            "semantic_similarity": semantic_score,
+            "must_have_score": features["must_have_score"],
+            "nice_to_have_score": features["nice_to_have_score"],
+            "missing_must_have": features["missing_must_have"],
+            "suggestions": None
+        })
+    ranked.sort(key=lambda r: r["score"], reverse=True)
+    ranked = ranked[:results_size]
+    timings["rerank_ms"] = _ms(start)
+
+    # Stage 3: suggestions for the finalists
+    start = time.perf_counter()
+    finalists = ranked[:max(0, min(suggestions_size, results_size))]
+    suggestions = await asyncio.gather(*(
+        agenerate_suggestions(missing_skills=r["missing_must_have"], role=jd_struct["title"], score=r["score"])
+        for r in finalists
+    ))
+    for result, suggestion in zip(finalists, suggestions):
+        result["suggestions"] = suggestion
+    timings["suggestions_ms"] = _ms(start)
+
+    for rank, result in enumerate(ranked, start=1):
+        result["rank"] = rank
+
+    return {
+        "pool_size": len(resume_index),
+        "shortlisted": len(shortlist),
+        "results": ranked,
+        "timings": timings
+    }
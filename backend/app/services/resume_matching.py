@@ -1,5 +1,7 @@
 from typing import List, Dict, Tuple
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
+from .skill_taxonomy import skill_index
 
 def extract_skills_from_resume(sections: Dict[str, str]) -> List[str]:
     skill_keys = ["skills", "technical_skills", "projects", "experience"]
@@ -13,43 +15,98 @@ def extract_skills_from_resume(sections: Dict[str, str]) -> List[str]:
                     skills.append(line)
     return list(set(skills))
 
+def match_skills_many(jd_skills: List[str], resume_skills_list: List[List[str]], threshold: int = 80) -> List[Tuple[int, List[str]]]:
+    # One JD skill list against many resumes: a single cdist over every resume line,
+    # then per-resume "any line above threshold" via reduceat over the column ranges
+    if not jd_skills:
+        return [(0, []) for _ in resume_skills_list]
+
+    lengths = [len(skills) for skills in resume_skills_list]
+    all_skills = [skill.lower() for skills in resume_skills_list for skill in skills]
+    if not all_skills:
+        return [(0, list(jd_skills)) for _ in resume_skills_list]
+
+    scores = process.cdist(
+        [skill.lower() for skill in jd_skills],
+        all_skills,
+        scorer=fuzz.partial_ratio,
+        score_cutoff=threshold,
+        workers=-1
+    )
+    offsets = np.cumsum([0] + lengths[:-1])
+    non_empty = [i for i, n in enumerate(lengths) if n]
+    hits = np.add.reduceat(scores >= threshold, offsets[non_empty], axis=1) > 0
+
+    results = [(0, list(jd_skills)) for _ in resume_skills_list]
+    for col, i in enumerate(non_empty):
+        matched = hits[:, col]
+        results[i] = (int(matched.sum()), [s for s, m in zip(jd_skills, matched) if not m])
+    return results
+
 def match_skills(jd_skills: List[str], resume_skills: List[str], threshold: int = 80) -> Tuple[int, List[str]]:
-    matched = []
-    for jd_skill in jd_skills:
-        for res_skill in resume_skills:
-            score = fuzz.partial_ratio(jd_skill.lower(), res_skill.lower())
-            if score >= threshold:
-                matched.append(jd_skill)
-                break
-    return len(matched), [s for s in jd_skills if s not in matched]
+    return match_skills_many(jd_skills, [resume_skills], threshold)[0]
 
-def compute_hard_match(jd: Dict, resume_sections: Dict) -> Dict:
-    resume_skills = extract_skills_from_resume(resume_sections)
+def match_canonical_skills(jd_skills: List[str], resume_skills: set) -> Tuple[int, List[str]]:
+    missing = [s for s in jd_skills if s not in resume_skills]
+    return len(jd_skills) - len(missing), missing
 
+def compute_hard_match_many(jd: Dict, resume_sections_list: List[Dict]) -> List[Dict]:
     must_have = jd.get("must_have", [])
     nice_to_have = jd.get("nice_to_have", [])
+    must_have_skills = jd.get("must_have_skills", [])
+    nice_to_have_skills = jd.get("nice_to_have_skills", [])
     degrees_required = jd.get("degrees", [])
     years_required = jd.get("years_required", 0)
 
-    must_matched, must_missing = match_skills(must_have, resume_skills)
-    nice_matched, nice_missing = match_skills(nice_to_have, resume_skills)
+    # Requirements the taxonomy can read are compared as canonical skill sets found in one linear
+    # scan of each resume. Bullets it can't read (no taxonomy skill in them) are still counted and
+    # fuzzy-matched against the resume's lines, so they can't silently drop out of the score
+    resume_skill_sets, resume_skills_list = None, None
 
-    must_score = round(must_matched / max(len(must_have), 1), 2)
-    nice_score = round(nice_matched / max(len(nice_to_have), 1), 2)
+    def match(jd_skills: List[str], bullets: List[str]) -> Tuple[List[str], List[Tuple[int, List[str]]]]:
+        nonlocal resume_skill_sets, resume_skills_list
+        unmatched = [bullet for bullet in bullets if not skill_index.extract(bullet)] if jd_skills else bullets
+        results = [(0, []) for _ in resume_sections_list]
+        if jd_skills:
+            if resume_skill_sets is None:
+                resume_skill_sets = [skill_index.extract("\n".join(sections.values())) for sections in resume_sections_list]
+            results = [match_canonical_skills(jd_skills, found) for found in resume_skill_sets]
+        if unmatched:
+            if resume_skills_list is None:
+                resume_skills_list = [extract_skills_from_resume(sections) for sections in resume_sections_list]
+            results = [
+                (matched + fuzzy_matched, missing + fuzzy_missing)
+                for (matched, missing), (fuzzy_matched, fuzzy_missing) in zip(results, match_skills_many(unmatched, resume_skills_list))
+            ]
+        return list(jd_skills) + unmatched, results
 
-    # Degree match
-    resume_text = " ".join(resume_sections.values()).lower()
-    degree_match = any(deg in resume_text for deg in degrees_required)
+    must_have, must_results = match(must_have_skills, must_have)
+    nice_to_have, nice_results = match(nice_to_have_skills, nice_to_have)
 
-    # Experience match (stubbed for now)
-    experience_match = 1.0 if years_required == 0 else 0.5  # We'll refine this later
+    features = []
+    for resume_sections, (must_matched, must_missing), (nice_matched, nice_missing) in zip(
+        resume_sections_list, must_results, nice_results
+    ):
+        must_score = round(must_matched / max(len(must_have), 1), 2)
+        nice_score = round(nice_matched / max(len(nice_to_have), 1), 2)
 
-    return {
-        "must_have_score": must_score,
-        "nice_to_have_score": nice_score,
-        "degree_match": degree_match,
-        "experience_match": experience_match,
-        "missing_must_have": must_missing,
-        "missing_nice_to_have": nice_missing
-    }
+        # Degree match
+        resume_text = " ".join(resume_sections.values()).lower()
+        degree_match = any(deg in resume_text for deg in degrees_required)
+
+        # Experience match (stubbed for now)
+        experience_match = 1.0 if years_required == 0 else 0.5  # We'll refine this later
+
+        features.append({
+            "must_have_score": must_score,
+            "nice_to_have_score": nice_score,
+            "degree_match": degree_match,
+            "experience_match": experience_match,
+            "missing_must_have": must_missing,
+            "missing_nice_to_have": nice_missing
+        })
+    return features
+
+def compute_hard_match(jd: Dict, resume_sections: Dict) -> Dict:
+    return compute_hard_match_many(jd, [resume_sections])[0]
 
@@ -1,26 +1,225 @@
-from typing import Dict
+import os
+import hashlib
+from typing import Dict, List, Optional, Tuple
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from .batching import MicroBatcher
+from .cache import MB, TieredCache
+from .executor import ENCODE_POOL_WORKERS, run_encode
+from .model_registry import embedding_namespace, get_embedding_model
 
-# Load once
-model = SentenceTransformer("all-MiniLM-L6-v2")
+ENCODE_BATCH_SIZE = int(os.getenv("ENCODE_BATCH_SIZE", "32"))
+ENCODE_BATCH_WINDOW_MS = float(os.getenv("ENCODE_BATCH_WINDOW_MS", "5"))
+ENCODE_BATCH_MAX = int(os.getenv("ENCODE_BATCH_MAX", "64"))
+# "blob" embeds summary+experience+projects as one text (truncated by the model at 256
+# word pieces); "chunked" embeds each bullet/chunk and aligns them to the JD requirements
+SEMANTIC_MODE = os.getenv("SEMANTIC_MODE", "blob")
+CHUNK_MAX_WORDS = int(os.getenv("SEMANTIC_CHUNK_MAX_WORDS", "60"))
+CHUNK_POOLING = os.getenv("SEMANTIC_CHUNK_POOLING", "mean")  # across requirements: "mean" or "max"
 
-def compute_semantic_similarity(jd_text: str, resume_sections: Dict[str, str]) -> float:
+# Repeat JDs and re-uploaded resumes skip the encoder entirely
+embedding_cache = TieredCache(
+    "embeddings",
+    memory_bytes=int(os.getenv("EMBEDDING_CACHE_MEMORY_MB", "64")) * MB,
+    disk_path=os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache.db"),
+    disk_bytes=int(os.getenv("EMBEDDING_CACHE_DISK_MB", "512")) * MB
+)
+
+def build_resume_text(resume_sections: Dict[str, str]) -> str:
     # Compare JD to resume summary + experience
     resume_text = ""
     for key in ["summary", "experience", "projects"]:
         if key in resume_sections:
             resume_text += resume_sections[key] + "\n"
+    return resume_text
+
+def normalize_for_embedding(text: str) -> str:
+    return " ".join(text.split())
+
+def embedding_key(text: str, namespace: str = None) -> str:
+    return hashlib.sha256(f"{namespace or embedding_namespace()}\x00{text}".encode("utf-8")).hexdigest()
+
+def encode_texts(texts: List[str]) -> np.ndarray:
+    texts = [normalize_for_embedding(t) for t in texts]
+    namespace = embedding_namespace()
+    keys = [embedding_key(t, namespace) for t in texts]
+
+    rows = [None] * len(texts)
+    pending = {}
+    for i, key in enumerate(keys):
+        blob = embedding_cache.get(key)
+        if blob is not None:
+            rows[i] = np.frombuffer(blob, dtype=np.float32)
+        else:
+            pending.setdefault(key, []).append(i)
+
+    if pending:
+        # One batched forward pass over the distinct misses; rows are unit length so cosine is a plain dot product
+        miss_keys = list(pending)
+        embs = get_embedding_model().encode(
+            [texts[pending[key][0]] for key in miss_keys],
+            batch_size=ENCODE_BATCH_SIZE,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ).astype(np.float32)
+        for key, emb in zip(miss_keys, embs):
+            embedding_cache.set(key, emb.tobytes())
+            for i in pending[key]:
+                rows[i] = emb
+
+    return np.vstack(rows)
+
+def embed_text(text: str) -> np.ndarray:
+    return encode_texts([text])[0]
+
+# Concurrent requests each encode a handful of texts; the coalescer merges those arriving within
+# ENCODE_BATCH_WINDOW_MS into one encode_texts call on the in-process encode pool
+encode_batcher = MicroBatcher(
+    encode_texts, max_batch=ENCODE_BATCH_MAX, window_ms=ENCODE_BATCH_WINDOW_MS, runner=run_encode, name="encode",
+    max_in_flight=ENCODE_POOL_WORKERS
+)
+
+async def aencode_texts(texts: List[str]) -> np.ndarray:
+    return await encode_batcher.submit(texts)
+
+def chunk_text(text: str, max_words: int = CHUNK_MAX_WORDS) -> List[str]:
+    # Bullets/lines are the natural unit; short lines are merged until max_words
+    chunks, current = [], []
+    for line in text.splitlines():
+        words = line.strip(" -•*\t").split()
+        if len(words) < 2:
+            continue
+        if current and len(current) + len(words) > max_words:
+            chunks.append(" ".join(current))
+            current = []
+        current.extend(words)
+        while len(current) > max_words:
+            chunks.append(" ".join(current[:max_words]))
+            current = current[max_words:]
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+def chunk_resume(resume_sections: Dict[str, str]) -> List[str]:
+    chunks = []
+    for key in ["summary", "experience", "projects"]:
+        if key in resume_sections:
+            chunks.extend(chunk_text(resume_sections[key]))
+    return chunks
+
+def semantic_inputs(
+    jd_text: str,
+    resume_sections_list: List[Dict[str, str]],
+    jd_requirements: List[str] = None,
+    mode: str = None
+) -> Tuple[List[str], List[List[str]]]:
+    # Query texts and, per resume, the texts aligned against them. "blob" is the one-query,
+    # one-text-per-resume case of "chunked", so both modes share the scoring below
+    if (mode or SEMANTIC_MODE) == "chunked":
+        requirements = [r for r in (jd_requirements or []) if r.strip()] or chunk_text(jd_text)
+        return requirements, [chunk_resume(sections) for sections in resume_sections_list]
+    resume_texts = [build_resume_text(sections) for sections in resume_sections_list]
+    return [jd_text], [[text] if text.strip() else [] for text in resume_texts]
+
+def score_alignment(query_embs: np.ndarray, doc_embs: np.ndarray, lengths: List[int]) -> List[float]:
+    scores = [0.0] * len(lengths)
+    non_empty = [i for i, n in enumerate(lengths) if n]
+    if not len(query_embs) or not non_empty:
+        return scores
+
+    # Best-matching text per query within each resume's column range, pooled across queries
+    sims = query_embs @ doc_embs.T
+    offsets = np.cumsum([0] + lengths[:-1])
+    best = np.maximum.reduceat(sims, offsets[non_empty], axis=1)
+    pooled = best.max(axis=0) if CHUNK_POOLING == "max" else best.mean(axis=0)
+    for col, i in enumerate(non_empty):
+        scores[i] = round(float(pooled[col]), 3)
+    return scores
+
+def stored_query_embeddings(
+    queries: List[str],
+    jd_emb: np.ndarray = None,
+    requirement_embs: np.ndarray = None,
+    mode: str = None
+) -> Optional[np.ndarray]:
+    # Embeddings the caller already has for the queries (e.g. from the JD registry), if they line up
+    embs = requirement_embs if (mode or SEMANTIC_MODE) == "chunked" else jd_emb
+    if embs is None:
+        return None
+    embs = embs.reshape(-1, embs.shape[-1])
+    return embs if len(embs) == len(queries) else None
 
-    if not resume_text.strip():
-        return 0.0
+def compute_semantic_similarity_many(
+    jd_text: str,
+    resume_sections_list: List[Dict[str, str]],
+    jd_emb: np.ndarray = None,
+    jd_requirements: List[str] = None,
+    mode: str = None,
+    requirement_embs: np.ndarray = None
+) -> List[float]:
+    queries, docs_list = semantic_inputs(jd_text, resume_sections_list, jd_requirements, mode)
+    docs = [text for texts in docs_list for text in texts]
+    if not queries or not docs:
+        return [0.0] * len(docs_list)
 
-    jd_emb = model.encode([jd_text], convert_to_tensor=True)
-    res_emb = model.encode([resume_text], convert_to_tensor=True)
+    # Queries and all resume texts go through the encoder together unless the JD was embedded already
+    query_embs = stored_query_embeddings(queries, jd_emb, requirement_embs, mode)
+    if query_embs is not None:
+        doc_embs = encode_texts(docs)
+    else:
+        embs = encode_texts(queries + docs)
+        query_embs, doc_embs = embs[:len(queries)], embs[len(queries):]
+    return score_alignment(query_embs, doc_embs, [len(texts) for texts in docs_list])
+
+def compute_semantic_similarity(
+    jd_text: str,
+    resume_sections: Dict[str, str],
+    jd_emb: np.ndarray = None,
+    jd_requirements: List[str] = None,
+    mode: str = None,
+    requirement_embs: np.ndarray = None
+) -> float:
+    return compute_semantic_similarity_many(
+        jd_text, [resume_sections], jd_emb=jd_emb, jd_requirements=jd_requirements, mode=mode,
+        requirement_embs=requirement_embs
+    )[0]
+
+async def aembed_text(text: str) -> np.ndarray:
+    return (await aencode_texts([text]))[0]
+
+async def acompute_semantic_similarity_many(
+    jd_text: str,
+    resume_sections_list: List[Dict[str, str]],
+    jd_emb: np.ndarray = None,
+    jd_requirements: List[str] = None,
+    mode: str = None,
+    requirement_embs: np.ndarray = None
+) -> List[float]:
+    # Same as compute_semantic_similarity_many, but the encode joins concurrent requests' batches
+    queries, docs_list = semantic_inputs(jd_text, resume_sections_list, jd_requirements, mode)
+    docs = [text for texts in docs_list for text in texts]
+    if not queries or not docs:
+        return [0.0] * len(docs_list)
+
+    query_embs = stored_query_embeddings(queries, jd_emb, requirement_embs, mode)
+    if query_embs is not None:
+        doc_embs = await aencode_texts(docs)
+    else:
+        embs = await aencode_texts(queries + docs)
+        query_embs, doc_embs = embs[:len(queries)], embs[len(queries):]
+    return score_alignment(query_embs, doc_embs, [len(texts) for texts in docs_list])
 
-    sim = cosine_similarity(jd_emb.cpu().numpy(), res_emb.cpu().numpy())[0][0]
-    return round(float(sim), 3)
+async def acompute_semantic_similarity(
+    jd_text: str,
+    resume_sections: Dict[str, str],
+    jd_requirements: List[str] = None,
+    mode: str = None,
+    jd_emb: np.ndarray = None,
+    requirement_embs: np.ndarray = None
+) -> float:
+    return (await acompute_semantic_similarity_many(
+        jd_text, [resume_sections], jd_emb=jd_emb, jd_requirements=jd_requirements, mode=mode,
+        requirement_embs=requirement_embs
+    ))[0]
 
 def compute_score(features: Dict, weights: Dict = None) -> Dict:
     # Default weights
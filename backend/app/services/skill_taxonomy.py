@@ -0,0 +1,187 @@
+import os
+import re
+import json
+import hashlib
+from collections import deque
+from typing import Dict, List, Set, Tuple
+
+# Canonical skill -> aliases (lowercase). SKILL_TAXONOMY_PATH may point at a JSON file of
+# the same shape to add skills or replace the aliases of existing ones.
+DEFAULT_TAXONOMY: Dict[str, List[str]] = {
+    "python": ["python", "python3", "python 3"],
+    "java": ["java", "core java", "java 8", "java 11", "java 17"],
+    "javascript": ["javascript", "js", "ecmascript", "es6"],
+    "typescript": ["typescript"],
+    "go": ["golang", "go lang"],
+    "rust": ["rust", "rustlang"],
+    "c++": ["c++", "cpp"],
+    "c#": ["c#", "csharp", "c sharp"],
+    "scala": ["scala"],
+    "kotlin": ["kotlin"],
+    "swift": ["swiftui", "swift programming", "swift language", "swift 5"],
+    "php": ["php"],
+    "ruby": ["ruby"],
+    "r": ["r programming", "rstudio", "r studio"],
+    "matlab": ["matlab"],
+    "bash": ["bash", "shell scripting", "shell script"],
+    "sql": ["sql", "t-sql", "pl/sql", "plsql"],
+    "postgresql": ["postgresql", "postgres", "psql"],
+    "mysql": ["mysql", "mariadb"],
+    "sqlite": ["sqlite"],
+    "mongodb": ["mongodb", "mongo"],
+    "redis": ["redis"],
+    "elasticsearch": ["elasticsearch", "elastic search", "opensearch"],
+    "cassandra": ["cassandra"],
+    "snowflake": ["snowflake"],
+    "bigquery": ["bigquery", "big query"],
+    "django": ["django", "django rest framework", "drf"],
+    "flask": ["flask"],
+    "fastapi": ["fastapi", "fast api"],
+    "spring": ["spring boot", "springboot", "spring framework", "spring mvc"],
+    "node.js": ["node.js", "nodejs", "node js"],
+    "express": ["express.js", "expressjs"],
+    "react": ["react", "react.js", "reactjs"],
+    "angular": ["angular", "angularjs", "angular.js"],
+    "vue": ["vue", "vue.js", "vuejs"],
+    "next.js": ["next.js", "nextjs"],
+    "html": ["html", "html5"],
+    "css": ["css", "css3", "scss", "sass"],
+    "tailwind": ["tailwind", "tailwindcss", "tailwind css"],
+    ".net": [".net", "dotnet", "asp.net", ".net core"],
+    "rest api": ["rest api", "rest apis", "restful", "restful api", "restful apis"],
+    "graphql": ["graphql"],
+    "grpc": ["grpc"],
+    "microservices": ["microservices", "micro services", "microservice"],
+    "docker": ["docker", "containerization", "docker containers"],
+    "kubernetes": ["kubernetes", "k8s", "eks", "gke", "aks"],
+    "helm": ["helm chart", "helm charts", "helm 3"],
+    "terraform": ["terraform"],
+    "ansible": ["ansible"],
+    # Service names alone ("s3", "lambda") also mean other things; they only count qualified
+    "aws": ["aws", "amazon web services", "aws lambda", "amazon s3", "amazon ec2"],
+    "azure": ["azure", "microsoft azure"],
+    "gcp": ["gcp", "google cloud", "google cloud platform"],
+    "linux": ["linux", "unix", "ubuntu"],
+    "git": ["git", "github", "gitlab", "bitbucket"],
+    "ci/cd": ["ci/cd", "ci cd", "cicd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "jenkins": ["jenkins"],
+    "github actions": ["github actions"],
+    "kafka": ["kafka", "apache kafka"],
+    "rabbitmq": ["rabbitmq"],
+    "spark": ["apache spark", "pyspark", "spark sql", "spark streaming"],
+    "hadoop": ["hadoop", "hdfs"],
+    "airflow": ["airflow", "apache airflow"],
+    "dbt": ["dbt"],
+    "etl": ["etl", "elt", "data pipelines", "data pipeline"],
+    "pandas": ["pandas"],
+    "numpy": ["numpy"],
+    "scikit-learn": ["scikit-learn", "scikit learn", "sklearn"],
+    "tensorflow": ["tensorflow", "tf2"],
+    "pytorch": ["pytorch", "torch"],
+    "keras": ["keras"],
+    "machine learning": ["machine learning", "ml"],
+    "deep learning": ["deep learning", "neural networks", "neural network"],
+    "nlp": ["nlp", "natural language processing"],
+    "computer vision": ["computer vision", "opencv", "image processing"],
+    "llm": ["llm", "llms", "large language models", "large language model", "generative ai", "genai"],
+    "langchain": ["langchain", "langgraph"],
+    "statistics": ["statistics", "statistical analysis", "statistical modeling"],
+    "data analysis": ["data analysis", "data analytics"],
+    "data visualization": ["data visualization", "data visualisation", "matplotlib", "seaborn", "plotly"],
+    "excel": ["ms excel", "microsoft excel", "advanced excel", "excel vba", "spreadsheets", "google sheets"],
+    "power bi": ["power bi", "powerbi"],
+    "tableau": ["tableau"],
+    "jira": ["jira"],
+    "agile": ["agile", "scrum", "kanban"],
+    "unit testing": ["unit testing", "unit tests", "pytest", "junit", "jest", "tdd", "test driven development"],
+    "system design": ["system design", "distributed systems", "scalable systems"],
+    "data structures": ["data structures", "algorithms", "dsa"],
+    "oop": ["oop", "object oriented programming", "object-oriented programming", "object oriented design"],
+    "figma": ["figma"],
+    "android": ["android"],
+    "ios": ["ios"],
+    "flutter": ["flutter"],
+    "react native": ["react native"],
+    "communication": ["communication skills", "verbal communication", "written communication"],
+}
+
+
+def load_taxonomy() -> Dict[str, List[str]]:
+    taxonomy = {skill: list(aliases) for skill, aliases in DEFAULT_TAXONOMY.items()}
+    path = os.getenv("SKILL_TAXONOMY_PATH")
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            taxonomy.update({skill.lower(): [a.lower() for a in aliases] for skill, aliases in json.load(f).items()})
+    return taxonomy
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text.lower())
+
+
+class SkillIndex:
+    """Aho-Corasick automaton over every alias; one pass over the text finds all skills."""
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self.skills = sorted(taxonomy)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+        for skill, aliases in taxonomy.items():
+            for alias in set(aliases):
+                self._add(normalize_text(alias).strip(), skill)
+        self._link()
+
+    def _add(self, alias: str, skill: str):
+        if not alias:
+            return
+        node = 0
+        for ch in alias:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][ch] = nxt
+            node = nxt
+        self._out[node].append((len(alias), skill))
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def extract(self, text: str) -> Set[str]:
+        text = normalize_text(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+        last = len(text) - 1
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, skill in out[node]:
+                # Only whole-token matches: "java" must not fire inside "javascript"
+                start = i - length + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (i == last or not text[i + 1].isalnum()):
+                    found.add(skill)
+        return found
+
+
+taxonomy = load_taxonomy()
+skill_index = SkillIndex(taxonomy)
+# Changes whenever the aliases do, so results derived from the taxonomy can be recognised as stale
+TAXONOMY_FINGERPRINT = hashlib.sha256(json.dumps(taxonomy, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def extract_skills(text: str) -> List[str]:
+    return sorted(skill_index.extract(text))
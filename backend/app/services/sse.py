@@ -0,0 +1,6 @@
+import json
+from typing import Any
+
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -1,19 +1,34 @@
 import os
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+import json
+import asyncio
+import hashlib
 import re
+from .cache import MB, TieredCache
+from .executor import run_io
+from .model_registry import get_chat_model
 
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+SCORE_BUCKET_SIZE = 10
 
-load_dotenv()  
+# Many candidates share the same gaps for the same role
+suggestion_cache = TieredCache(
+    "suggestions",
+    memory_bytes=int(os.getenv("SUGGESTION_CACHE_MEMORY_MB", "16")) * MB,
+    disk_path=os.getenv("SUGGESTION_CACHE_PATH", "./suggestion_cache.db"),
+    disk_bytes=int(os.getenv("SUGGESTION_CACHE_DISK_MB", "64")) * MB
+)
 
-api_key = os.getenv("GEMINI_API_KEY")  
+_semaphore = None
+_semaphore_loop = None
+_inflight = {}
 
-model = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash", 
-    temperature=0.1,
-    max_output_tokens=1000,
-    google_api_key=api_key     
-)
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore, _semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore_loop is not loop:
+        _semaphore, _semaphore_loop = asyncio.Semaphore(LLM_MAX_CONCURRENCY), loop
+    return _semaphore
 
 
 
@@ -32,8 +47,17 @@ def parse_suggestion(text: str, max_per_section: int = 5) -> dict:
         "experience_suggestions": extract_section("Experience Suggestions")
     }
 
-def generate_suggestions(missing_skills: list, role: str, score: float = None) -> dict:
-    prompt = f"""
+def score_bucket(score: float = None) -> str:
+    if score is None:
+        return "na"
+    return str(int(score // SCORE_BUCKET_SIZE) * SCORE_BUCKET_SIZE)
+
+def suggestion_key(missing_skills: list, role: str, score: float = None) -> str:
+    parts = [type(get_chat_model()).__name__, (role or "").strip().lower(), sorted(set(missing_skills or [])), score_bucket(score)]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+def build_prompt(missing_skills: list, role: str, score: float = None) -> str:
+    return f"""
     The candidate is applying for a role as {role}.
     Their resume received a relevance score of {score}/100.
     The following must-have skills were missing: {', '.join(missing_skills) if missing_skills else 'None explicitly detected'}.
@@ -44,13 +68,50 @@ def generate_suggestions(missing_skills: list, role: str, score: float = None) -
     3. Experience Suggestions (bullet points)
     """
 
+def failed_suggestions(error: Exception) -> dict:
+    return {
+        "error": str(error),
+        "resume_fixes": [],
+        "skills_to_add": [],
+        "experience_suggestions": []
+    }
+
+def generate_suggestions(missing_skills: list, role: str, score: float = None) -> dict:
+    key = suggestion_key(missing_skills, role, score)
+    cached = suggestion_cache.get(key)
+    if cached is not None:
+        return json.loads(cached)
+
+    try:
+        response = get_chat_model().invoke(build_prompt(missing_skills, role, score))
+        result = parse_suggestion(response.content)
+    except Exception as e:
+        return failed_suggestions(e)
+    suggestion_cache.set(key, json.dumps(result).encode("utf-8"))
+    return result
+
+async def _ainvoke_and_cache(key: str, prompt: str) -> dict:
+    async with _get_semaphore():
+        response = await get_chat_model().ainvoke(prompt)
+    result = parse_suggestion(response.content)
+    await run_io(suggestion_cache.set, key, json.dumps(result).encode("utf-8"))
+    return result
+
+async def agenerate_suggestions(missing_skills: list, role: str, score: float = None) -> dict:
+    # The key may build the chat model and the disk tier may wait on a locked file, so neither
+    # runs on the event loop
+    key = await run_io(suggestion_key, missing_skills, role, score)
+    cached = await run_io(suggestion_cache.get, key)
+    if cached is not None:
+        return json.loads(cached)
+
+    # Concurrent requests with the same gaps share one LLM call
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_ainvoke_and_cache(key, build_prompt(missing_skills, role, score)))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
     try:
-        response = model.invoke(prompt)
-        return parse_suggestion(response.content)
+        return dict(await asyncio.shield(task))
     except Exception as e:
-        return {
-            "error": str(e),
-            "resume_fixes": [],
-            "skills_to_add": [],
-            "experience_suggestions": []
-        }
\ No newline at end of file
+        return failed_suggestions(e)
@@ -0,0 +1,242 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from backend.app.db.session import SessionLocal
+from backend.app.models.resume_document import ResumeDocument
+from .model_registry import embedding_namespace
+from .scoring import build_resume_text, encode_texts
+from .skill_taxonomy import TAXONOMY_FINGERPRINT, extract_skills, skill_index
+
+REBUILD_BATCH_SIZE = 64
+
+
+class ResumeIndex:
+    """Flat inner-product index over the stored resume embeddings.
+
+    Rows live in the resume_documents table; this process keeps them as one float32
+    matrix and pulls in rows added since the last search (by any worker) before querying.
+    Rows embedded by another model/backend or tagged with an older taxonomy are rebuilt in
+    place on the first refresh, so they rejoin the index instead of being left out.
+    """
+
+    def __init__(self):
+        # One boolean column per taxonomy skill, for vectorized skill overlap
+        self.skill_columns = {skill: col for col, skill in enumerate(skill_index.skills)}
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, namespace: Optional[str]):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.matrix: Optional[np.ndarray] = None
+        self.skill_matrix = np.zeros((0, len(self.skill_columns)), dtype=bool)
+        self._last_id = 0
+        self._namespace = namespace
+        self._rebuilt = False
+
+    def refresh(self):
+        with self._lock:
+            namespace = embedding_namespace()
+            if namespace != self._namespace:
+                # First load, or the embedding server now runs another model/backend: start over
+                self._reset(namespace)
+            if not self._rebuilt:
+                rebuild_stale_documents(namespace)
+                self._rebuilt = True
+            db = SessionLocal()
+            try:
+                rows = (
+                    db.query(ResumeDocument.id, ResumeDocument.embedding, ResumeDocument.skills)
+                    .filter(ResumeDocument.id > self._last_id)
+                    .filter(ResumeDocument.embedding_model == namespace)
+                    .order_by(ResumeDocument.id)
+                    .all()
+                )
+            finally:
+                db.close()
+            if not rows:
+                return
+            new = np.vstack([np.frombuffer(emb, dtype=np.float32) for _, emb, _ in rows])
+            skills = np.zeros((len(rows), len(self.skill_columns)), dtype=bool)
+            for i, (_, _, doc_skills) in enumerate(rows):
+                cols = [self.skill_columns[skill] for skill in doc_skills or [] if skill in self.skill_columns]
+                skills[i, cols] = True
+            self.matrix = new if self.matrix is None else np.vstack([self.matrix, new])
+            self.skill_matrix = np.vstack([self.skill_matrix, skills])
+            self.ids = np.concatenate([self.ids, np.array([doc_id for doc_id, _, _ in rows], dtype=np.int64)])
+            self._last_id = rows[-1][0]
+
+    def search(self, query: np.ndarray, top_k: int = 10) -> List[Tuple[int, float]]:
+        self.refresh()
+        if self.matrix is None or top_k <= 0:
+            return []
+        # Rows and query are unit length, so the dot product is the cosine similarity
+        scores = self.matrix @ query.astype(np.float32)
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self.ids[i]), round(float(scores[i]), 3)) for i in top]
+
+    def shortlist(self, query: np.ndarray, must_have_skills: List[str], top_n: int,
+                  semantic_weight: float = 0.5, min_score: float = 0.0) -> List[Tuple[int, float, float, float]]:
+        # Cheap first stage over every stored resume: cosine plus must-have skill overlap,
+        # both as whole-matrix operations. Returns (doc_id, score, cosine, overlap).
+        self.refresh()
+        if self.matrix is None or top_n <= 0:
+            return []
+        cosine = self.matrix @ query.astype(np.float32)
+        cols = [self.skill_columns[skill] for skill in must_have_skills if skill in self.skill_columns]
+        if cols:
+            overlap = self.skill_matrix[:, cols].mean(axis=1)
+            scores = semantic_weight * cosine + (1 - semantic_weight) * overlap
+        else:
+            overlap = np.zeros_like(cosine)
+            scores = cosine
+        candidates = np.flatnonzero(scores >= min_score)
+        if not len(candidates):
+            return []
+        k = min(top_n, len(candidates))
+        top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (int(self.ids[i]), round(float(scores[i]), 3), round(float(cosine[i]), 3), round(float(overlap[i]), 3))
+            for i in top
+        ]
+
+    def __len__(self):
+        return len(self.ids)
+
+
+resume_index = ResumeIndex()
+
+
+def document_text(sections: Dict[str, str]) -> str:
+    return build_resume_text(sections) or "\n".join(sections.values())
+
+
+def update_stale(docs: List[ResumeDocument], namespace: str):
+    # Re-embed rows from another model/backend and re-extract skills from an older taxonomy
+    reembed = [doc for doc in docs if doc.embedding_model != namespace]
+    if reembed:
+        embs = encode_texts([document_text(doc.sections or {}) for doc in reembed])
+        for doc, emb in zip(reembed, embs):
+            doc.embedding_model = namespace
+            doc.embedding = emb.astype(np.float32).tobytes()
+    for doc in docs:
+        if doc.skills_version != TAXONOMY_FINGERPRINT:
+            doc.skills = extract_skills("\n".join((doc.sections or {}).values()))
+            doc.skills_version = TAXONOMY_FINGERPRINT
+
+
+def rebuild_stale_documents(namespace: str) -> int:
+    stale = or_(
+        ResumeDocument.embedding_model.is_distinct_from(namespace),
+        ResumeDocument.skills_version.is_distinct_from(TAXONOMY_FINGERPRINT)
+    )
+    db = SessionLocal()
+    rebuilt = 0
+    try:
+        while True:
+            docs = db.query(ResumeDocument).filter(stale).order_by(ResumeDocument.id).limit(REBUILD_BATCH_SIZE).all()
+            if not docs:
+                return rebuilt
+            update_stale(docs, namespace)
+            db.commit()
+            rebuilt += len(docs)
+    finally:
+        db.close()
+
+
+def _insert_new(db: Session):
+    # INSERT ... ON CONFLICT (content_hash) DO NOTHING, so concurrent indexing of the same new
+    # resume keeps the first row instead of failing the whole batch
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(ResumeDocument).on_conflict_do_nothing(index_elements=["content_hash"])
+
+
+def _find_documents(db: Session, hashes: List[str]) -> Dict[str, ResumeDocument]:
+    return {
+        doc.content_hash: doc
+        for doc in db.query(ResumeDocument).filter(ResumeDocument.content_hash.in_(hashes))
+    }
+
+
+def index_resumes(items: List[Tuple[str, str, Dict[str, str], Optional[int]]]) -> List[int]:
+    # items: (filename, content_hash, sections, evaluation_id). Documents are keyed by content
+    # hash, so re-uploads only point the existing row at the latest evaluation (and bring it up
+    # to date if it was embedded or skill-tagged under another configuration).
+    db = SessionLocal()
+    try:
+        namespace = embedding_namespace()
+        hashes = [content_hash for _, content_hash, _, _ in items]
+        existing = _find_documents(db, hashes)
+        update_stale(list(existing.values()), namespace)
+        new = {}
+        for filename, content_hash, sections, _ in items:
+            if content_hash not in existing and content_hash not in new:
+                new[content_hash] = (filename, sections)
+        if new:
+            embs = encode_texts([document_text(sections) for _, sections in new.values()])
+            db.execute(_insert_new(db), [
+                {
+                    "content_hash": content_hash,
+                    "resume_filename": filename,
+                    "sections": sections,
+                    "skills": extract_skills("\n".join(sections.values())),
+                    "skills_version": TAXONOMY_FINGERPRINT,
+                    "embedding_model": namespace,
+                    "embedding": emb.astype(np.float32).tobytes()
+                }
+                for (content_hash, (filename, sections)), emb in zip(new.items(), embs)
+            ])
+            existing = _find_documents(db, hashes)
+        for _, content_hash, _, evaluation_id in items:
+            if evaluation_id is not None:
+                existing[content_hash].evaluation_id = evaluation_id
+        db.commit()
+        return [existing[content_hash].id for content_hash in hashes]
+    finally:
+        db.close()
+
+
+def load_documents(doc_ids: List[int]) -> Dict[int, dict]:
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(
+                ResumeDocument.id, ResumeDocument.resume_filename, ResumeDocument.evaluation_id,
+                ResumeDocument.skills, ResumeDocument.timestamp
+            )
+            .filter(ResumeDocument.id.in_(doc_ids))
+            .all()
+        )
+        return {
+            r.id: {
+                "document_id": r.id,
+                "resume_filename": r.resume_filename,
+                "evaluation_id": r.evaluation_id,
+                "skills": r.skills,
+                "indexed_at": r.timestamp.isoformat()
+            }
+            for r in rows
+        }
+    finally:
+        db.close()
+
+
+def load_document_sections(doc_ids: List[int]) -> Dict[int, dict]:
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(ResumeDocument.id, ResumeDocument.resume_filename, ResumeDocument.evaluation_id, ResumeDocument.sections)
+            .filter(ResumeDocument.id.in_(doc_ids))
+            .all()
+        )
+        return {
+            r.id: {"resume_filename": r.resume_filename, "evaluation_id": r.evaluation_id, "sections": r.sections or {}}
+            for r in rows
+        }
+    finally:
+        db.close()
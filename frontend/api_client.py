@@ -0,0 +1,158 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_URL = os.getenv("BACKEND_URL", "https://skillsyncer-rkmaurya.hf.space")
+# (connect, read) seconds; evaluation waits on the LLM, so reads get a long budget
+TIMEOUT = (5, 120)
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "10"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    # One pooled keep-alive session per Streamlit server, shared across reruns and users.
+    # Only idempotent GETs are retried
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], allowed_methods=["GET"])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=BATCH_CONCURRENCY * 2, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _get(path, params=None):
+    response = get_session().get(f"{BASE_URL}{path}", params=params, timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def _post(path, files, data=None, params=None):
+    response = get_session().post(f"{BASE_URL}{path}", files=files, data=data, params=params, timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+# Cached reads: failures raise and are not cached, so the wrappers below report them
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_history(params):
+    return _get("/evaluate/history", params)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_stats(params):
+    return _get("/evaluate/stats", params)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_titles(params):
+    return _get("/evaluate/titles", params)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_detail(result_id):
+    return _get(f"/evaluate/{result_id}")
+
+
+def fetch_history(params=None):
+    try:
+        return _cached_history(params)
+    except Exception as e:
+        st.error(f"❌ Failed to fetch history: {e}")
+        return []
+
+
+def fetch_stats(params=None):
+    try:
+        return _cached_stats(params)
+    except Exception as e:
+        st.error(f"❌ Failed to fetch stats: {e}")
+        return {}
+
+
+def fetch_titles(params=None):
+    try:
+        return _cached_titles(params)
+    except Exception as e:
+        st.error(f"❌ Failed to fetch JD titles: {e}")
+        return []
+
+
+def fetch_detail(result_id):
+    try:
+        return _cached_detail(int(result_id))
+    except Exception as e:
+        st.error(f"❌ Failed to fetch detail: {e}")
+        return {}
+
+
+def invalidate():
+    # New evaluations should show up on the dashboard right away
+    _cached_history.clear()
+    _cached_stats.clear()
+    _cached_titles.clear()
+
+
+def jd_upload(jd_text, jd_file):
+    if jd_file:
+        return (jd_file.name, jd_file.getvalue(), jd_file.type)
+    return ("jd.txt", jd_text.encode("utf-8"), "text/plain")
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _register_jd(name, data, mime):
+    return _post("/upload/jd", {"file": (name, data, mime)})["jd_id"]
+
+
+def register_jd(jd_text, jd_file):
+    # The backend keeps structured JDs by content; upload each one once and refer to it by id
+    return _register_jd(*jd_upload(jd_text, jd_file))
+
+
+def analyze_resume(jd_text, jd_file, resume_file):
+    files = {"resume_file": (resume_file.name, resume_file.getvalue(), resume_file.type)}
+    try:
+        result = _post("/evaluate/", files, data={"jd_id": register_jd(jd_text, jd_file)})
+        invalidate()
+        return result
+    except Exception as e:
+        st.error(f"❌ Evaluation failed: {e}")
+        return None
+
+
+def _evaluate_chunk(jd_id, resume_files, include_suggestions):
+    files = [("resume_files", (f.name, f.getvalue(), f.type)) for f in resume_files]
+    return _post("/evaluate/batch", files, data={"jd_id": jd_id, "include_suggestions": str(include_suggestions).lower()})
+
+
+def evaluate_many(jd_text, jd_file, resume_files, include_suggestions=False, on_progress=None):
+    """Sends resumes to /evaluate/batch in chunks, several chunks at a time, and merges the rankings."""
+    try:
+        jd_id = register_jd(jd_text, jd_file)
+    except Exception as e:
+        return {"results": [], "failed": [{"resume_filename": f.name, "error": str(e)} for f in resume_files]}
+    chunks = [resume_files[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(resume_files), BATCH_CHUNK_SIZE)]
+    results, failed, done = [], [], 0
+    with ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY) as pool:
+        futures = {pool.submit(_evaluate_chunk, jd_id, chunk, include_suggestions): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                response = future.result()
+                results.extend(response["results"])
+                failed.extend(response["failed"])
+            except Exception as e:
+                failed.extend({"resume_filename": f.name, "error": str(e)} for f in chunk)
+            done += len(chunk)
+            if on_progress:
+                on_progress(done, len(resume_files))
+
+    invalidate()
+    # Each chunk was ranked on its own; rank the merged list again
+    results.sort(key=lambda r: r["score"], reverse=True)
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+    return {"results": results, "failed": failed}
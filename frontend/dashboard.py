@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
-import requests
+from datetime import datetime, timedelta
+from api_client import analyze_resume, evaluate_many, fetch_detail, fetch_history, fetch_stats, fetch_titles
 from components.header import render_header
 from components.footer import render_footer
 
@@ -16,46 +17,6 @@ render_header()
 # --- View Selector ---
 tab = st.selectbox("🔀 Switch View", ["🎓 Student Portal", "🧑‍💼 Recruiter Dashboard"])
 
-# --- Backend URL ---
-BASE_URL = "https://skillsyncer-rkmaurya.hf.space"
-
-
-
-
-def analyze_resume(jd_text, jd_file, resume_file):
-    files = {
-        "resume_file": (resume_file.name, resume_file.getvalue(), resume_file.type)
-    }
-    if jd_file:
-        files["jd_file"] = (jd_file.name, jd_file.getvalue(), jd_file.type)
-    else:
-        files["jd_file"] = ("jd.txt", jd_text.encode("utf-8"), "text/plain")
-    return requests.post(f"{BASE_URL}/evaluate/", files=files).json()
-
-def fetch_history(params=None):
-    return requests.get(f"{BASE_URL}/evaluate/history", params=params).json()
-
-def fetch_detail(result_id):
-    return requests.get(f"{BASE_URL}/evaluate/{result_id}").json()
-
-def fetch_history(params=None):
-    try:
-        response = requests.get(f"{BASE_URL}/history", params=params)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        st.error(f"❌ Failed to fetch history: {e}")
-        return []
-
-def fetch_detail(result_id):
-    try:
-        response = requests.get(f"{BASE_URL}/{result_id}")
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        st.error(f"❌ Failed to fetch detail: {e}")
-        return {}
-
 # --- Student Portal ---
 if "Student" in tab:
     st.subheader("📄 Resume Relevance Checker")
@@ -110,28 +71,97 @@ elif "Recruiter" in tab:
     st.subheader("📊 Recruiter Dashboard")
     st.markdown("View and filter past evaluations.")
 
-    all_data = fetch_history()
-    df = pd.DataFrame(all_data)
-
-    if not df.empty:
-        search = st.text_input("🔍 Search Resume Filename")
-        if search:
-            df = df[df["resume_filename"].str.contains(search, case=False)]
-
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            verdict = st.selectbox("Verdict", ["All"] + sorted(df["verdict"].unique()))
-        with col2:
-            min_score, max_score = st.slider("Score Range", 0, 100, (0, 100))
-        with col3:
-            jd_title = st.selectbox("JD Title", ["All"] + sorted(df["jd_title"].unique()))
-
-        filtered = df[
-            df["score"].between(min_score, max_score) &
-            (df["verdict"] == verdict if verdict != "All" else True) &
-            (df["jd_title"] == jd_title if jd_title != "All" else True)
-        ]
-
+    with st.expander("📥 Bulk Evaluate Resumes"):
+        bulk_jd_file = st.file_uploader("Job Description", type=["pdf", "docx", "txt"], key="bulk_jd")
+        bulk_jd_text = st.text_area("...or paste the JD", height=150, key="bulk_jd_text")
+        bulk_resumes = st.file_uploader(
+            "Resumes", type=["pdf", "docx", "txt", "zip"], accept_multiple_files=True, key="bulk_resumes"
+        )
+        include_suggestions = st.checkbox("Generate improvement suggestions (slower)")
+
+        if st.button("🚀 Evaluate All"):
+            if bulk_resumes and (bulk_jd_file or bulk_jd_text):
+                progress = st.progress(0.0, text=f"Evaluated 0 of {len(bulk_resumes)}")
+
+                def on_progress(done, total):
+                    progress.progress(done / total, text=f"Evaluated {done} of {total}")
+
+                outcome = evaluate_many(
+                    bulk_jd_text, bulk_jd_file, bulk_resumes,
+                    include_suggestions=include_suggestions, on_progress=on_progress
+                )
+                if outcome["results"]:
+                    st.dataframe(
+                        pd.DataFrame(outcome["results"])[
+                            ["rank", "resume_filename", "score", "verdict", "semantic_similarity", "missing_must_have"]
+                        ],
+                        use_container_width=True
+                    )
+                for failure in outcome["failed"]:
+                    st.warning(f"{failure['resume_filename']}: {failure['error']}")
+            else:
+                st.error("Please provide a JD and at least one resume.")
+
+    # Filters are applied by the backend, which returns aggregates and one page of rows
+    window = st.selectbox("Time Window", ["All time", "Last 7 days", "Last 30 days", "Last 90 days"])
+    days = {"Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90}.get(window)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        verdict = st.selectbox("Verdict", ["All", "High", "Medium", "Low"])
+    with col2:
+        min_score, max_score = st.slider("Score Range", 0, 100, (0, 100))
+    with col3:
+        jd_title = st.selectbox("JD Title", ["All"] + fetch_titles({"days": days} if days else None))
+    search = st.text_input("🔍 Search Resume Filename")
+
+    params = {"min_score": min_score, "max_score": max_score}
+    if days:
+        params["days"] = days
+    if verdict != "All":
+        params["verdict"] = verdict
+    if jd_title != "All":
+        # Picked from the list, so match it exactly rather than as a substring
+        params["jd_title"] = jd_title
+        params["jd_title_exact"] = True
+    if search:
+        params["resume_filename"] = search
+
+    stats = fetch_stats(params)
+    if stats.get("total"):
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Evaluations", stats["total"])
+        m2.metric("Average Score", stats["average_score"])
+        m3.metric("High Fit", stats["verdict_counts"].get("High", 0))
+        m4.metric("Low Fit", stats["verdict_counts"].get("Low", 0))
+
+        c1, c2 = st.columns(2)
+        with c1:
+            st.markdown("**Score Distribution**")
+            hist = pd.DataFrame(stats["score_histogram"])
+            hist["range"] = hist["min"].astype(int).astype(str) + "–" + hist["max"].astype(int).astype(str)
+            st.bar_chart(hist.set_index("range")["count"])
+        with c2:
+            st.markdown("**Most Frequently Missing Must-Have Skills**")
+            skills = pd.DataFrame(stats["top_missing_must_have"])
+            if not skills.empty:
+                st.bar_chart(skills.set_index("skill")["count"])
+
+        if stats["timeline"]:
+            st.markdown("**Evaluations per Day**")
+            st.line_chart(pd.DataFrame(stats["timeline"]).set_index("date")[["count"]])
+
+        st.markdown("**Average Score by JD Title**")
+        st.dataframe(pd.DataFrame(stats["jd_titles"]), use_container_width=True)
+
+    history_params = {key: value for key, value in params.items() if key != "days"}
+    if days:
+        # Whole hours keep the cache key stable across reruns
+        since = (datetime.utcnow() - timedelta(days=days)).replace(minute=0, second=0, microsecond=0)
+        history_params["start_date"] = since.isoformat()
+    filtered = pd.DataFrame(fetch_history(history_params))
+
+    if not filtered.empty:
         def verdict_color(val):
             if val == "High":
                 return "background-color: #d1fae5; color: #065f46"
@@ -148,7 +178,7 @@ elif "Recruiter" in tab:
                 "border": "1px solid #ddd"
             })
 
-        st.markdown("### 📁 Filtered Evaluations")
+        st.markdown("### 📁 Latest Matching Evaluations")
         st.dataframe(styled_df, use_container_width=True)
 
         st.markdown("### 🔍 Detailed Evaluation")